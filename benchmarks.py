@@ -2,13 +2,20 @@ from __future__ import annotations
 
 import json
 import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+from typing import Callable, Dict, Hashable, Iterable, List, Tuple, TypeVar
 
 import pandas as pd
 import yfinance as yf
 
+try:  # optional fast path; stdlib json is the fallback
+    import orjson
+except ImportError:  # pragma: no cover - depends on local environment
+    orjson = None
+
 
 CACHE_PATH = Path("data/benchmarks.json")
 
@@ -41,72 +48,210 @@ def last_complete_month(today: date | None = None) -> pd.Period:
     return pd.Period(last_day_prev_month, freq="M")
 
 
+# In-process copy of the cache file, reused while the file on disk is unchanged. Callers
+# (one thread per Streamlit session) never see this dict itself, only copies of it, and the
+# lock makes each parse or save plus its bookkeeping one step; no network work runs under it.
+_CACHE: Dict | None = None
+_CACHE_KEY: Tuple[Path, int, int] | None = None
+_CACHE_LOCK = threading.Lock()
+
+
+def _cache_file_key() -> Tuple[Path, int, int] | None:
+    try:
+        st = CACHE_PATH.stat()
+    except FileNotFoundError:
+        return None
+    return (CACHE_PATH, st.st_mtime_ns, st.st_size)
+
+
+def _copy_cache(cache: Dict) -> Dict:
+    """Copy ``cache`` down to the nesting level the fill helpers write into."""
+    copied = {k: dict(v) if isinstance(v, dict) else v for k, v in cache.items()}
+    if isinstance(copied.get("_aligned"), dict):
+        copied["_aligned"] = {sym: dict(months) for sym, months in copied["_aligned"].items()}
+    return copied
+
+
 def _load_cache() -> Dict[str, Dict[str, float]]:
-    if CACHE_PATH.exists():
-        with open(CACHE_PATH, "r") as f:
-            return json.load(f)
-    return {}
+    """Return a private, freely mutable copy of the cache file's contents."""
+    global _CACHE, _CACHE_KEY
+    with _CACHE_LOCK:
+        key = _cache_file_key()
+        if key is None:
+            return {}
+        if _CACHE is None or _CACHE_KEY != key:
+            raw = CACHE_PATH.read_bytes()
+            _CACHE = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            _CACHE_KEY = key
+        return _copy_cache(_CACHE)
 
 
 def _save_cache(cache: Dict[str, Dict[str, float]]) -> None:
-    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(CACHE_PATH, "w") as f:
-        json.dump(cache, f, indent=2)
+    """Write ``cache`` to the cache file and keep a copy of it as the in-process version."""
+    global _CACHE, _CACHE_KEY
+    if orjson is not None:
+        payload = orjson.dumps(cache, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(cache, indent=2).encode()
+    with _CACHE_LOCK:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        CACHE_PATH.write_bytes(payload)
+        _CACHE = _copy_cache(cache)
+        _CACHE_KEY = _cache_file_key()
+
+
+_T = TypeVar("_T")
+
+_INFLIGHT: Dict[Hashable, Future] = {}
+_FETCH_LOCK = threading.Lock()
+# Successful downloads are remembered for the rest of the process (oldest evicted first).
+_FETCHED: Dict[Hashable, pd.DataFrame] = {}
+_FETCHED_MAX = 256
+
+
+def _coalesced(key: Hashable, fetch: Callable[[], _T]) -> _T:
+    """Run ``fetch`` once for concurrent callers sharing ``key``; the others wait on it."""
+    with _FETCH_LOCK:
+        if key in _FETCHED:
+            return _FETCHED[key]
+        future = _INFLIGHT.get(key)
+        owner = future is None
+        if owner:
+            future = _INFLIGHT[key] = Future()
+    if not owner:
+        return future.result()
+    try:
+        result = fetch()
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _FETCH_LOCK:
+            _INFLIGHT.pop(key, None)
+            if future.done() and future.exception() is None:
+                _remember(key, future.result())
+
+
+def _remember(key: Hashable, result: object) -> None:
+    # Empty frames usually mean a transient upstream failure; let the next call retry.
+    if not isinstance(result, pd.DataFrame) or result.empty:
+        return
+    _FETCHED[key] = result
+    while len(_FETCHED) > _FETCHED_MAX:
+        del _FETCHED[next(iter(_FETCHED))]
 
 
 def _periods_to_str(periods: Iterable[pd.Period]) -> List[str]:
     return [str(p) for p in periods]
 
 
-def fetch_monthly_returns(symbol: str, start_period: pd.Period, end_period: pd.Period) -> pd.Series:
+def _close_series(frame: pd.DataFrame, symbol: str) -> pd.Series:
+    """Extract the close column for ``symbol`` from a (possibly multi-ticker) download."""
+    if isinstance(frame.columns, pd.MultiIndex):
+        if symbol not in frame.columns.get_level_values(0):
+            return pd.Series(dtype=float)
+        frame = frame[symbol]
+    if "Close" not in frame:
+        return pd.Series(dtype=float)
+    return frame["Close"].dropna()
+
+
+def _monthly_returns_from_closes(
+    closes: pd.Series, start_period: pd.Period, end_period: pd.Period
+) -> pd.Series:
+    if closes.empty:
+        return pd.Series(dtype=float)
+    # Normalize timezone to tz-naive to avoid tz-drop warnings during period conversion
+    if isinstance(closes.index, pd.DatetimeIndex) and closes.index.tz is not None:
+        closes = closes.tz_localize(None)
+    rets = closes.pct_change().dropna()
+    rets.index = rets.index.to_period("M")
+    # Limit to requested period window; bars are sorted, so slice on the int64 ordinals
+    ordinals = rets.index.asi8
+    lo = ordinals.searchsorted(start_period.ordinal, side="left")
+    hi = ordinals.searchsorted(end_period.ordinal, side="right")
+    return rets.iloc[lo:hi]
+
+
+def fetch_monthly_returns_many(
+    symbols: Iterable[str], start_period: pd.Period, end_period: pd.Period
+) -> Dict[str, pd.Series]:
+    """Fetch monthly returns for several symbols with a single batched download."""
+    symbols = list(dict.fromkeys(symbols))
+    if not symbols:
+        return {}
     start = (start_period.to_timestamp("M") - pd.offsets.MonthBegin(1)).normalize()
     end = end_period.to_timestamp("M")
     try:
-        hist = yf.Ticker(symbol).history(
-            start=start,
-            end=end + pd.offsets.MonthEnd(1),
-            interval="1mo",
-            auto_adjust=True,
+        hist = _coalesced(
+            ("monthly", tuple(symbols), start, end),
+            lambda: yf.download(
+                symbols,
+                start=start,
+                end=end + pd.offsets.MonthEnd(1),
+                interval="1mo",
+                auto_adjust=True,
+                group_by="ticker",
+                threads=True,
+                progress=False,
+            ),
         )
     except Exception:
-        return pd.Series(dtype=float)
-    if hist.empty:
-        return pd.Series(dtype=float)
-    # Normalize timezone to tz-naive to avoid tz-drop warnings during period conversion
-    if isinstance(hist.index, pd.DatetimeIndex) and hist.index.tz is not None:
-        hist = hist.copy()
-        hist.index = hist.index.tz_localize(None)
-    closes = hist["Close"].copy()
-    rets = closes.pct_change().dropna()
-    periods = rets.index.to_period("M")
-    rets.index = periods
-    # Limit to requested period window
-    rets = rets[(rets.index >= start_period) & (rets.index <= end_period)]
-    return rets
+        return {sym: pd.Series(dtype=float) for sym in symbols}
+    if hist is None or hist.empty:
+        return {sym: pd.Series(dtype=float) for sym in symbols}
+    return {
+        sym: _monthly_returns_from_closes(_close_series(hist, sym), start_period, end_period)
+        for sym in symbols
+    }
+
+
+def fetch_monthly_returns(symbol: str, start_period: pd.Period, end_period: pd.Period) -> pd.Series:
+    return fetch_monthly_returns_many([symbol], start_period, end_period)[symbol]
+
+
+def _wall_clock_index(index: pd.Index) -> pd.Index:
+    # Compare on local wall-clock time so tz-aware bars line up with tz-naive dates; a no-op
+    # for history fetched here, which is already naive.
+    if isinstance(index, pd.DatetimeIndex) and index.tz is not None:
+        return index.tz_localize(None)
+    return index
 
 
 def _first_trading_close(series: pd.Series, start: pd.Timestamp) -> float | None:
-    # Normalize timezone to tz-naive to avoid tz-aware vs naive comparisons
-    if isinstance(series.index, pd.DatetimeIndex) and series.index.tz is not None:
-        series = series.copy()
-        series.index = series.index.tz_localize(None)
-    s = series[series.index >= start]
-    if not s.empty:
-        return float(s.iloc[0])
+    # Price history is sorted, so binary-search rather than masking the whole index
+    pos = _wall_clock_index(series.index).searchsorted(start, side="left")
+    if pos < len(series):
+        return float(series.iloc[pos])
     return None
 
 
 def _last_trading_close(series: pd.Series, end: pd.Timestamp) -> float | None:
-    # Normalize timezone to tz-naive to avoid tz-aware vs naive comparisons
-    if isinstance(series.index, pd.DatetimeIndex) and series.index.tz is not None:
-        series = series.copy()
-        series.index = series.index.tz_localize(None)
-    s = series[series.index <= end]
-    if not s.empty:
-        return float(s.iloc[-1])
+    pos = _wall_clock_index(series.index).searchsorted(end, side="right")
+    if pos > 0:
+        return float(series.iloc[pos - 1])
     return None
 
 
+def _daily_history(symbol: str, start_ts: pd.Timestamp, end_ts: pd.Timestamp) -> pd.DataFrame:
+    # A fresh Ticker per call: Ticker objects carry mutable per-instance state and are not safe
+    # to share across the fetch pool's threads (the HTTP session is shared by yfinance anyway).
+    hist = yf.Ticker(symbol).history(
+        start=start_ts,
+        end=end_ts + pd.offsets.Day(1),
+        interval="1d",
+        auto_adjust=True,
+    )
+    # yfinance returns exchange-local tz-aware bars; drop the tz once on the fresh frame so
+    # the trading-day lookups compare directly against naive dates.
+    if isinstance(hist.index, pd.DatetimeIndex) and hist.index.tz is not None:
+        hist.index = hist.index.tz_localize(None)
+    return hist
+
+
 def fetch_partial_return(symbol: str, start_date: date, end_date: date) -> float | None:
     """Fetch adjusted-close based return between two dates inclusive.
 
@@ -118,17 +263,14 @@ def fetch_partial_return(symbol: str, start_date: date, end_date: date) -> float
     start_ts = pd.Timestamp(start_date)
     end_ts = pd.Timestamp(end_date)
     try:
-        hist = yf.Ticker(symbol).history(
-            start=start_ts,
-            end=end_ts + pd.offsets.Day(1),
-            interval="1d",
-            auto_adjust=True,
+        hist = _coalesced(
+            ("daily", symbol, start_ts, end_ts), lambda: _daily_history(symbol, start_ts, end_ts)
         )
     except Exception:
         return None
     if hist.empty:
         return None
-    closes = hist["Close"].copy()
+    closes = hist["Close"]
     first = _first_trading_close(closes, start_ts)
     last = _last_trading_close(closes, end_ts)
     if first is None or last is None or first == 0:
@@ -137,97 +279,164 @@ def fetch_partial_return(symbol: str, start_date: date, end_date: date) -> float
 
 
 def ensure_benchmark_cache(
-    symbols: Iterable[str], needed_months: Iterable[pd.Period]
+    symbols: Iterable[str],
+    needed_months: Iterable[pd.Period],
+    cache: Dict | None = None,
 ) -> Dict[str, Dict[str, float]]:
+    """Fill missing full-month returns for ``symbols``.
+
+    When ``cache`` is given it is updated in place and the caller is responsible for saving
+    it; otherwise the cache file is loaded and rewritten if anything new arrived.
+    """
+    if cache is not None:
+        _fill_monthly_returns(cache, symbols, needed_months)
+        return cache
     cache = _load_cache()
+    # Warm-cache lookups are read-only; only rewrite the file when new months arrived.
+    if _fill_monthly_returns(cache, symbols, needed_months):
+        _save_cache(cache)
+    return cache
+
+
+def _fill_monthly_returns(
+    cache: Dict, symbols: Iterable[str], needed_months: Iterable[pd.Period]
+) -> bool:
     lcm = last_complete_month()
     needed = [p for p in needed_months if p <= lcm]
     if not needed:
-        return cache
+        return False
 
+    # Work out what each symbol is missing, then fetch all of them in one batched call
+    # spanning the union of the missing windows.
+    needed_keys = {str(p): p for p in needed}
+    missing_by_symbol: Dict[str, List[pd.Period]] = {}
     for sym in symbols:
-        sym_cache = cache.get(sym, {})
-        missing = [p for p in needed if str(p) not in sym_cache]
-        if not missing:
-            cache[sym] = sym_cache
-            continue
-        start_p, end_p = min(missing), max(missing)
-        series = fetch_monthly_returns(sym, start_p, end_p)
-        for p, v in series.items():
-            if p <= lcm:
-                sym_cache[str(p)] = float(v)
-        cache[sym] = sym_cache
-
-    _save_cache(cache)
-    return cache
+        sym_cache = cache.setdefault(sym, {})
+        missing = [needed_keys[key] for key in needed_keys.keys() - sym_cache.keys()]
+        if missing:
+            missing_by_symbol[sym] = missing
+
+    updated = False
+    if missing_by_symbol:
+        all_missing = [p for periods in missing_by_symbol.values() for p in periods]
+        fetched = fetch_monthly_returns_many(
+            list(missing_by_symbol), min(all_missing), max(all_missing)
+        )
+        for sym, series in fetched.items():
+            sym_cache = cache[sym]
+            missing_keys = set(_periods_to_str(missing_by_symbol[sym]))
+            for p, v in series.items():
+                key = str(p)
+                if p <= lcm and key in missing_keys:
+                    sym_cache[key] = float(v)
+                    updated = True
+    return updated
 
 
-def get_benchmark_series(symbol: str, months: Iterable[pd.Period]) -> pd.Series:
-    cache = ensure_benchmark_cache([symbol], months)
-    mapping = cache.get(symbol, {})
-    values = {pd.Period(k): v for k, v in mapping.items()}
-    out = []
-    for m in months:
-        if m in values:
-            out.append((m, values[m]))
-    if not out:
+def _month_keys(months: Iterable[pd.Period]) -> Tuple[pd.PeriodIndex, pd.Index]:
+    """Return the requested months as a PeriodIndex plus their "YYYY-MM" cache keys."""
+    requested = pd.PeriodIndex(list(months), freq="M")
+    return requested, requested.strftime("%Y-%m")
+
+
+def _lookup_months(
+    values: pd.Series, requested: pd.PeriodIndex, keys: pd.Index, name: str
+) -> pd.Series:
+    """Align string-keyed cached values to the requested months, dropping missing ones."""
+    found = values.reindex(keys).to_numpy()
+    series = pd.Series(found, index=requested, name=name).dropna()
+    if series.empty:
         return pd.Series(dtype=float)
-    idx = pd.PeriodIndex([m for m, _ in out], freq="M")
-    data = [v for _, v in out]
-    return pd.Series(data, index=idx, name=symbol).sort_index()
+    return series.sort_index()
+
+
+def get_benchmark_series_many(
+    symbols: Iterable[str], months: Iterable[pd.Period]
+) -> Dict[str, pd.Series]:
+    """Return cached monthly returns for several benchmarks, filling the cache once."""
+    symbols = list(dict.fromkeys(symbols))
+    requested, keys = _month_keys(months)
+    cache = ensure_benchmark_cache(symbols, requested)
+    return {
+        symbol: _lookup_months(
+            pd.Series(cache.get(symbol, {}), dtype=float), requested, keys, symbol
+        )
+        for symbol in symbols
+    }
+
+
+def get_benchmark_series(symbol: str, months: Iterable[pd.Period]) -> pd.Series:
+    return get_benchmark_series_many([symbol], months)[symbol]
 
 
 def ensure_aligned_partials(
-    symbols: Iterable[str], inception_date: date, current_end: date
+    symbols: Iterable[str],
+    inception_date: date,
+    current_end: date,
+    cache: Dict | None = None,
 ) -> Dict:
     """Ensure cache contains aligned partial returns for inception and current months.
 
     Stores under top-level key "_aligned":
       { symbol: { "YYYY-MM": { start: str, end: str, return: float, as_of: str } } }
+
+    As with ``ensure_benchmark_cache``, a passed-in ``cache`` is updated but not saved.
     """
+    if cache is not None:
+        _fill_aligned_partials(cache, symbols, inception_date, current_end)
+        return cache
     cache = _load_cache()
+    if _fill_aligned_partials(cache, symbols, inception_date, current_end):
+        _save_cache(cache)
+    return cache
+
+
+def _fill_aligned_partials(
+    cache: Dict, symbols: Iterable[str], inception_date: date, current_end: date
+) -> bool:
     aligned = cache.get("_aligned", {})
 
     inception_month = pd.Period(inception_date, freq="M")
     current_month = pd.Period(current_end, freq="M")
 
+    # Inception partial (from inception_date to month end)
+    inc_end = inception_month.to_timestamp("M")  # end of month timestamp
+    inc_end_date = (inc_end + pd.offsets.MonthEnd(0)).date()
+    key_inc = str(inception_month)
+    # Current partial (from month start to current_end)
+    cm_start_date = date(current_month.start_time.year, current_month.start_time.month, 1)
+    key_cur = str(current_month)
+
+    updated = False
+    tasks: List[Tuple[str, str, date, date]] = []
     for sym in symbols:
-        sym_aligned = aligned.get(sym, {})
-        # Inception partial (from inception_date to month end)
-        inc_end = inception_month.to_timestamp("M")  # end of month timestamp
-        inc_end_date = (inc_end + pd.offsets.MonthEnd(0)).date()
-        key_inc = str(inception_month)
+        sym_aligned = aligned.setdefault(sym, {})
         if key_inc not in sym_aligned:
-            r = fetch_partial_return(sym, inception_date, inc_end_date)
-            if r is not None:
-                sym_aligned[key_inc] = {
-                    "start": str(inception_date),
-                    "end": str(inc_end_date),
-                    "return": r,
-                    "as_of": str(inc_end_date),
-                }
-
-        # Current partial (from month start to current_end)
-        cm_start_date = date(current_month.start_time.year, current_month.start_time.month, 1)
-        key_cur = str(current_month)
+            tasks.append((sym, key_inc, inception_date, inc_end_date))
         existing = sym_aligned.get(key_cur)
-        needs_update = existing is None or existing.get("end") != str(current_end)
-        if needs_update:
-            r = fetch_partial_return(sym, cm_start_date, current_end)
+        if existing is None or existing.get("end") != str(current_end):
+            tasks.append((sym, key_cur, cm_start_date, current_end))
+
+    if tasks:
+        # Each partial is an independent HTTPS round-trip; overlap them across symbols.
+        with ThreadPoolExecutor(max_workers=min(8, len(tasks))) as executor:
+            results = list(executor.map(lambda t: fetch_partial_return(t[0], t[2], t[3]), tasks))
+        # Apply in submission order so the current-month partial wins when it shares a key
+        # with the inception partial.
+        for (sym, key, start_d, end_d), r in zip(tasks, results):
             if r is not None:
-                sym_aligned[key_cur] = {
-                    "start": str(cm_start_date),
-                    "end": str(current_end),
+                aligned[sym][key] = {
+                    "start": str(start_d),
+                    "end": str(end_d),
                     "return": r,
-                    "as_of": str(current_end),
+                    "as_of": str(end_d),
                 }
-
-        aligned[sym] = sym_aligned
+                updated = True
 
     cache["_aligned"] = aligned
-    cache.setdefault("_meta", {})["last_updated"] = datetime.utcnow().isoformat() + "Z"
-    _save_cache(cache)
-    return cache
+    if updated:
+        cache.setdefault("_meta", {})["last_updated"] = datetime.utcnow().isoformat() + "Z"
+    return updated
 
 
 def get_aligned_benchmark_series(
@@ -242,23 +451,15 @@ def get_aligned_benchmark_series(
     - Current ongoing month uses partial from month start to current_end.
     - All other months use cached full-month returns (up to last complete month).
     """
-    # Ensure we have monthly for full months
-    ensure_benchmark_cache([symbol], months)
-    # Ensure aligned for inception and current
-    cache = ensure_aligned_partials([symbol], inception_date, current_end)
-    monthly_map = _load_cache().get(symbol, {})
+    requested, keys = _month_keys(months)
+    # Fill full months and the inception/current partials, then write the file at most once.
+    cache = _load_cache()
+    updated = _fill_monthly_returns(cache, [symbol], requested)
+    updated |= _fill_aligned_partials(cache, [symbol], inception_date, current_end)
+    if updated:
+        _save_cache(cache)
+    monthly = pd.Series(cache.get(symbol, {}), dtype=float)
     aligned = cache.get("_aligned", {}).get(symbol, {})
-
-    out = []
-    for m in months:
-        key = str(m)
-        if key in aligned:
-            out.append((m, float(aligned[key]["return"])))
-        elif key in monthly_map:
-            out.append((m, float(monthly_map[key])))
-        # else skip missing
-    if not out:
-        return pd.Series(dtype=float)
-    idx = pd.PeriodIndex([m for m, _ in out], freq="M")
-    data = [v for _, v in out]
-    return pd.Series(data, index=idx, name=symbol).sort_index()
+    partials = pd.Series({k: v["return"] for k, v in aligned.items()}, dtype=float)
+    # Aligned partials take precedence over full-month returns for the same month.
+    return _lookup_months(partials.combine_first(monthly), requested, keys, symbol)
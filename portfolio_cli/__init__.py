@@ -1,20 +1,41 @@
 """User-facing entry-point helpers for the portfolio CLI."""
 
-from .analysis import (  # noqa: F401
-    ANNUAL_RF_RATE,
-    FIDELITY_CSV_PATH,
-    JSON_FILE_PATH,
-    PerformanceMetrics,
-    PortfolioAnalysis,
-    calculate_metrics,
-    calculate_monthly_returns,
-    format_portfolio_summary,
-    load_daily_changes,
-    load_fidelity_monthly_returns,
-    run_portfolio_analysis,
-)
-from .cli import app, run  # noqa: F401
-from .shell import start_shell  # noqa: F401
+from __future__ import annotations
+
+from importlib import import_module
+from typing import Any
+
+from .defaults import ANNUAL_RF_RATE, FIDELITY_CSV_PATH, JSON_FILE_PATH  # noqa: F401
+
+# Public names resolved on first access so importing the package (e.g. for the CLI entry
+# point) does not pull in pandas and the analytics stack up front.
+_LAZY_EXPORTS = {
+    "PerformanceMetrics": ".analysis",
+    "PortfolioAnalysis": ".analysis",
+    "calculate_metrics": ".analysis",
+    "calculate_monthly_returns": ".analysis",
+    "format_portfolio_summary": ".analysis",
+    "load_daily_changes": ".analysis",
+    "load_fidelity_monthly_returns": ".analysis",
+    "run_portfolio_analysis": ".analysis",
+    "app": ".cli",
+    "run": ".cli",
+    "start_shell": ".shell",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
 
 __all__ = [
     "ANNUAL_RF_RATE",
@@ -8,19 +8,38 @@ subcommands (e.g. DCF modelling or alternative benchmark lookups).
 from __future__ import annotations
 
 import csv
+import hashlib
+import io
 import json
+import mmap
+import os
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Iterable, TextIO, cast
+from typing import Any, BinaryIO, Callable, Iterable, TextIO, cast
 
 import numpy as np
 import pandas as pd
 
+try:  # optional fast path; stdlib json is the fallback
+    import orjson
+except ImportError:  # pragma: no cover - depends on local environment
+    orjson = None
 
-JSON_FILE_PATH = Path("data/valuations.json")
-FIDELITY_CSV_PATH = Path("data/private/fidelity-performance.csv")
-ANNUAL_RF_RATE = 0.04
+from portfolio_cli.defaults import ANNUAL_RF_RATE, FIDELITY_CSV_PATH, JSON_FILE_PATH
+
+# Parsed monthly returns are cached next to each input file under this directory name.
+MONTHLY_CACHE_DIRNAME = ".portfolio_cache"
+# Bump when the parsers or the cache layout change so stale parsed copies are not reused.
+MONTHLY_CACHE_VERSION = 1
+# JSON inputs at least this large are memory-mapped for orjson instead of read into bytes.
+MMAP_MIN_BYTES = 1 << 16
+
+
+# Copy-on-Write lets derived frames share buffers until written; it is the only mode from
+# pandas 3 onwards, so just opt in on older versions.
+if int(pd.__version__.split(".", 1)[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
 
 
 @dataclass
@@ -49,17 +68,32 @@ class PortfolioAnalysis:
     metrics: PerformanceMetrics
 
 
+def _load_json(path: Path) -> Any:
+    """Parse a JSON file, letting orjson read large files straight from a memory map."""
+
+    if orjson is None:
+        return json.loads(path.read_bytes())
+    with path.open("rb") as handle:
+        if os.fstat(handle.fileno()).st_size < MMAP_MIN_BYTES:
+            return orjson.loads(handle.read())
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                return orjson.loads(view)
+            finally:
+                view.release()  # the map cannot close while a view is exported
+
+
 def load_daily_changes(json_file: str | Path) -> pd.DataFrame:
     """Read SavvyTrader valuations JSON into a sorted DataFrame."""
 
-    with Path(json_file).open("r") as handle:
-        data: Iterable[dict[str, Any]] = json.load(handle)
+    data: Iterable[dict[str, Any]] = _load_json(Path(json_file))
 
     df = pd.DataFrame(data)
     if "summaryDate" not in df or "dailyTotalValueChange" not in df:
         raise ValueError("JSON file must contain summaryDate and dailyTotalValueChange fields")
 
-    df["summaryDate"] = pd.to_datetime(df["summaryDate"])
+    df["summaryDate"] = pd.to_datetime(df["summaryDate"], format="ISO8601")
     df = df.sort_values("summaryDate")
     return df
 
@@ -73,38 +107,61 @@ def calculate_monthly_returns(df: pd.DataFrame, drop_zeros: bool = True) -> pd.S
     if df.empty:
         return pd.Series(dtype=float)
 
-    df = df.copy()
-    df["month"] = df["summaryDate"].dt.to_period("M")
-    monthly = df.groupby("month")["dailyTotalValueChange"].apply(lambda s: float(np.prod(1 + s) - 1))
+    # Compound with a groupby product: vectorized, and exact for changes at or below -100%
+    # (where a log-sum would go -inf/NaN). Missing days are skipped, as np.prod did.
+    months = df["summaryDate"].dt.to_period("M").rename("month")
+    monthly = (1 + df["dailyTotalValueChange"]).groupby(months).prod() - 1
     monthly.index = pd.PeriodIndex(monthly.index, freq="M")
     return monthly.sort_index()
 
 
-def calculate_metrics(monthly_returns: pd.Series, annual_rf: float, current_year: int) -> PerformanceMetrics:
-    """Compute CAGR, drawdown, Sharpe/Sortino, and year-to-date return."""
+def _metrics_kernel(
+    arr: np.ndarray, years: np.ndarray, current_year: int, monthly_rf: float, num_months: int
+) -> tuple[float | None, float, float | None, float | None, float | None]:
+    """Return ``(cagr, max_dd_monthly, ytd, sharpe, sortino)`` for a non-empty, NaN-free array.
 
-    if monthly_returns.empty:
-        return PerformanceMetrics(cagr=None, max_dd_monthly=None, ytd=None, sharpe=None, sortino=None)
+    ``num_months`` is the span the returns cover (gaps included), which sets the CAGR horizon.
+    """
 
-    monthly_rf = annual_rf / 12
-    mean_excess = float(np.mean(monthly_returns) - monthly_rf)
-    std = float(np.std(monthly_returns, ddof=1))
-    downside = np.minimum(monthly_returns - monthly_rf, 0)
-    down_dev = float(np.sqrt(np.mean(downside**2)))
+    excess = arr - monthly_rf
+    mean_excess = float(excess.mean())
+    # The sample std of a single month is undefined; NaN, as Series.std gives, without a warning.
+    std = float(arr.std(ddof=1)) if len(arr) > 1 else float("nan")
+    # Clip once and take the sum of squares as a dot product: no mask or squared temporaries.
+    downside = np.minimum(excess, 0.0)
+    down_dev = float(np.sqrt(downside.dot(downside) / len(downside)))
 
     sharpe = mean_excess / std * np.sqrt(12) if std != 0 else None
     sortino = mean_excess / down_dev * np.sqrt(12) if down_dev != 0 else None
 
-    total_cum_return = float(np.prod(1 + monthly_returns) - 1)
-    num_years = len(monthly_returns) / 12
+    growth = 1 + arr
+    total_cum_return = float(growth.prod() - 1)
+    num_years = num_months / 12
     cagr = (1 + total_cum_return) ** (1 / num_years) - 1 if num_years > 0 else None
 
-    period_filter = monthly_returns.index.year == current_year
-    ytd_months = monthly_returns[period_filter]
-    ytd_perf = float(np.prod(1 + ytd_months) - 1) if not ytd_months.empty else None
+    in_year = years == current_year
+    ytd_perf = float(growth[in_year].prod() - 1) if in_year.any() else None
 
-    max_dd_monthly = float(monthly_returns.min()) if not monthly_returns.empty else None
+    return cagr, float(arr.min()), ytd_perf, sharpe, sortino
 
+
+def calculate_metrics(monthly_returns: pd.Series, annual_rf: float, current_year: int) -> PerformanceMetrics:
+    """Compute CAGR, drawdown, Sharpe/Sortino, and year-to-date return."""
+
+    # Missing months are skipped, as the pandas reductions did; they still count towards the
+    # span CAGR annualizes over.
+    num_months = len(monthly_returns)
+    monthly_returns = monthly_returns.dropna()
+    if monthly_returns.empty:
+        return PerformanceMetrics(cagr=None, max_dd_monthly=None, ytd=None, sharpe=None, sortino=None)
+
+    cagr, max_dd_monthly, ytd_perf, sharpe, sortino = _metrics_kernel(
+        monthly_returns.to_numpy(dtype=float),
+        monthly_returns.index.year.to_numpy(),
+        current_year,
+        annual_rf / 12,
+        num_months,
+    )
     return PerformanceMetrics(
         cagr=cagr,
         max_dd_monthly=max_dd_monthly,
@@ -114,12 +171,28 @@ def calculate_metrics(monthly_returns: pd.Series, annual_rf: float, current_year
     )
 
 
-def load_fidelity_monthly_returns(csv_file: str | Path | TextIO) -> pd.Series:
-    """Parse Fidelity export into a monthly return series."""
+def _parse_amounts(cells: pd.DataFrame) -> pd.DataFrame:
+    """Convert Fidelity currency cells ("$1,234.50", "(12.00)", "-") to floats."""
+
+    cleaned = cells.replace(r"[$,\s]", "", regex=True)
+    cleaned = cleaned.replace(r"^\((.*)\)$", r"-\1", regex=True)
+    return cleaned.replace({"": "0", "-": "0"}).astype(float)
+
+
+def load_fidelity_monthly_returns(csv_file: str | Path | TextIO | BinaryIO) -> pd.Series:
+    """Parse Fidelity export into a monthly return series.
+
+    Binary buffers (e.g. ``io.BytesIO`` of an upload) are decoded incrementally as UTF-8 with
+    an optional BOM, so callers need not build a decoded copy of the whole file first.
+    """
 
     handle: TextIO
     close_handle = False
-    if hasattr(csv_file, "read"):
+    detach_handle = False
+    if isinstance(csv_file, (io.RawIOBase, io.BufferedIOBase)):
+        handle = io.TextIOWrapper(csv_file, encoding="utf-8-sig", newline="")
+        detach_handle = True
+    elif hasattr(csv_file, "read"):
         handle = cast(TextIO, csv_file)
     else:
         path = Path(csv_file)
@@ -147,52 +220,116 @@ def load_fidelity_monthly_returns(csv_file: str | Path | TextIO) -> pd.Series:
         if headers is None:
             raise ValueError("Could not locate 'Monthly' header in Fidelity CSV")
 
-        periods: list[pd.Period] = []
-        values: list[float] = []
+        if not data_rows:
+            return pd.Series(dtype=float, index=pd.PeriodIndex([], freq="M"))
 
-        def _to_number(raw: str) -> float:
-            cleaned = raw.replace("$", "").replace(",", "").strip()
-            if not cleaned or cleaned == "-":
-                return 0.0
-            if cleaned.startswith("(") and cleaned.endswith(")"):
-                cleaned = f"-{cleaned[1:-1]}"
-            return float(cleaned)
+        frame = pd.DataFrame([(row + [""] * 9)[:9] for row in data_rows], dtype=str)
+        labels = frame[0].str.split("(").str[0].str.strip()
+        keep = labels != ""
+        frame, labels = frame[keep], labels[keep]
+        try:
+            periods = pd.PeriodIndex(labels.to_numpy(), freq="M")
+        except (TypeError, ValueError) as exc:  # pragma: no cover - unexpected format
+            raise ValueError(f"Unable to parse month labels {list(labels)!r}") from exc
 
-        for row in data_rows:
-            month_label = row[0].split("(")[0].strip()
-            if not month_label:
-                continue
-            try:
-                period = pd.Period(month_label, freq="M")
-            except Exception as exc:  # pragma: no cover - unexpected format
-                raise ValueError(f"Unable to parse month label '{month_label}'") from exc
-
-            cells = (row + [""] * 9)[:9]
-            beginning = _to_number(cells[1])
-            market_change = _to_number(cells[2])
-            dividends = _to_number(cells[3])
-            interest = _to_number(cells[4])
-            deposits = _to_number(cells[5])
-            withdrawals = _to_number(cells[6])
-            net_fees = _to_number(cells[7])
-
-            performance = market_change + dividends + interest - net_fees
-            _ = deposits, withdrawals  # explicit for future cash-flow analytics
-
-            if beginning <= 0:
-                monthly_return = float("nan")
-            else:
-                monthly_return = performance / beginning
+        amounts = _parse_amounts(frame.iloc[:, 1:8])
+        beginning = amounts[1]
+        market_change, dividends, interest = amounts[2], amounts[3], amounts[4]
+        net_fees = amounts[7]
+        # deposits (5) and withdrawals (6) are parsed for future cash-flow analytics
 
-            periods.append(period)
-            values.append(monthly_return)
+        performance = market_change + dividends + interest - net_fees
+        monthly_return = (performance / beginning).where(beginning > 0)
 
-        series = pd.Series(values, index=pd.PeriodIndex(periods, freq="M"))
+        series = pd.Series(monthly_return.to_numpy(), index=periods)
         series = series.sort_index()
         return series.dropna()
     finally:
         if close_handle:
             handle.close()
+        elif detach_handle:
+            handle.detach()  # leave the caller's binary buffer open
+
+
+def _cached_monthly_returns(
+    source_key: str, path: Path, loader: Callable[[Path], pd.Series]
+) -> pd.Series:
+    """Return ``loader(path)``, reusing a parsed copy from ``<dir>/.portfolio_cache``.
+
+    The cache file name is derived from the resolved path, size, mtime and
+    ``MONTHLY_CACHE_VERSION``, so edits to the export (or to the parsers) simply miss and
+    re-parse; older entries for the same source file (and nothing else) are removed when a
+    new one is written.
+    Entries hold plain numeric arrays and are loaded with ``allow_pickle=False``, so a file
+    planted in the data directory cannot execute code.
+    """
+
+    st = path.stat()
+    resolved = str(path.resolve())
+    prefix = f"{source_key}-{hashlib.sha256(resolved.encode()).hexdigest()[:16]}"
+    fingerprint = f"{MONTHLY_CACHE_VERSION}|{st.st_size}|{st.st_mtime_ns}"
+    cache_dir = path.parent / MONTHLY_CACHE_DIRNAME
+    digest = hashlib.sha256(fingerprint.encode()).hexdigest()[:16]
+    cache_file = cache_dir / f"{prefix}-{digest}.npz"
+    try:
+        return _read_monthly_cache(cache_file)
+    except Exception:  # missing or corrupt; rebuild it
+        pass
+
+    monthly_returns = loader(path)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(".tmp")
+        _write_monthly_cache(tmp_file, monthly_returns)
+        os.replace(tmp_file, cache_file)
+        for stale in cache_dir.glob(f"{prefix}-*.npz"):
+            if stale != cache_file:
+                stale.unlink(missing_ok=True)
+    except OSError:  # read-only data directory; caching is best-effort
+        pass
+    return monthly_returns
+
+
+def _write_monthly_cache(target: Path, monthly_returns: pd.Series) -> None:
+    index = pd.PeriodIndex(monthly_returns.index, freq="M")
+    names = json.dumps([monthly_returns.name, index.name])
+    with open(target, "wb") as handle:
+        np.savez(
+            handle,
+            ordinals=index.asi8,
+            values=monthly_returns.to_numpy(dtype=float),
+            names=np.array(names),
+        )
+
+
+def _read_monthly_cache(source: Path) -> pd.Series:
+    with np.load(source, allow_pickle=False) as data:
+        name, index_name = json.loads(str(data["names"]))
+        index = pd.PeriodIndex(
+            pd.arrays.PeriodArray(data["ordinals"], dtype=pd.PeriodDtype("M")), name=index_name
+        )
+        return pd.Series(data["values"], index=index, name=name)
+
+
+def load_monthly_returns(source: str, input_path: str | Path) -> pd.Series:
+    """Load and aggregate monthly returns for ``source`` without computing any metrics."""
+
+    source_key = source.lower()
+    path = Path(input_path)
+
+    if source_key == "savvytrader":
+        if not path.exists():
+            raise FileNotFoundError(path)
+        return _cached_monthly_returns(
+            source_key, path, lambda p: calculate_monthly_returns(load_daily_changes(p))
+        )
+    if source_key == "fidelity":
+        if not path.exists():
+            raise FileNotFoundError(path)
+        return _cached_monthly_returns(source_key, path, load_fidelity_monthly_returns)
+    raise ValueError(
+        f"Unsupported source '{source}'. Expected 'savvytrader' or 'fidelity'."
+    )
 
 
 def run_portfolio_analysis(
@@ -208,23 +345,9 @@ def run_portfolio_analysis(
     if current_year is None:
         current_year = datetime.now().year
 
-    source_key = source.lower()
-
-    if source_key == "savvytrader":
-        path = Path(input_path) if input_path is not None else Path(json_file)
-        if not path.exists():
-            raise FileNotFoundError(path)
-        df = load_daily_changes(path)
-        monthly_returns = calculate_monthly_returns(df)
-    elif source_key == "fidelity":
-        path = Path(input_path) if input_path is not None else Path(fidelity_file)
-        if not path.exists():
-            raise FileNotFoundError(path)
-        monthly_returns = load_fidelity_monthly_returns(path)
-    else:
-        raise ValueError(
-            f"Unsupported source '{source}'. Expected 'savvytrader' or 'fidelity'."
-        )
+    if input_path is None:
+        input_path = fidelity_file if source.lower() == "fidelity" else json_file
+    monthly_returns = load_monthly_returns(source, input_path)
 
     metrics = calculate_metrics(monthly_returns, annual_rf, current_year)
     return PortfolioAnalysis(monthly_returns=monthly_returns, metrics=metrics)
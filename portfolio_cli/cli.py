@@ -8,18 +8,30 @@ import os
 import shutil
 import subprocess
 import sys
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
-import pandas as pd
 import typer
-from rich import box
-from rich.console import Console
-from rich.table import Table
 
-from portfolio_cli.analysis import ANNUAL_RF_RATE, FIDELITY_CSV_PATH, JSON_FILE_PATH
-from portfolio_cli.performance import SUPPORTED_SOURCES, SourceKind, collect_performance_data
-from portfolio_cli.report import render_html_report
-from portfolio_cli.shell import start_shell
+# Only what the command tree needs is imported here; pandas, numpy, rich and the analytics
+# modules are imported inside the commands so `--help` and completion stay fast.
+from portfolio_cli.defaults import ANNUAL_RF_RATE, FIDELITY_CSV_PATH, JSON_FILE_PATH, SourceKind
+
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+_CONSOLE: Optional[Console] = None
+
+
+def _get_console() -> Console:
+    """Return the shared Rich console, created on first use (terminal probing is not free)."""
+
+    global _CONSOLE
+    if _CONSOLE is None:
+        from rich.console import Console
+
+        _CONSOLE = Console()
+    return _CONSOLE
 
 
 app = typer.Typer(
@@ -31,6 +43,44 @@ app = typer.Typer(
 )
 
 
+# Parameters shared by the `performance` and `report` commands, built once at import.
+_SOURCES_ARGUMENT = typer.Argument(
+    None,
+    case_sensitive=False,
+    help="Portfolio sources to include (savvytrader fidelity). Defaults to both.",
+)
+_SAVVY_JSON_OPTION = typer.Option(
+    JSON_FILE_PATH,
+    "--savvy-json",
+    file_okay=True,
+    dir_okay=False,
+    readable=True,
+    help="Path to SavvyTrader valuations JSON file.",
+    show_default=True,
+)
+_FIDELITY_CSV_OPTION = typer.Option(
+    FIDELITY_CSV_PATH,
+    "--fidelity-csv",
+    file_okay=True,
+    dir_okay=False,
+    readable=True,
+    help="Path to Fidelity investment income CSV export.",
+    show_default=True,
+)
+_RF_OPTION = typer.Option(
+    ANNUAL_RF_RATE,
+    "--rf",
+    min=0.0,
+    help="Annual risk-free rate used for Sharpe/Sortino calculations (e.g., 0.04).",
+    show_default=True,
+)
+_YEAR_OPTION = typer.Option(
+    None,
+    "--year",
+    help="Calendar year to use for YTD performance (defaults to the current year).",
+)
+
+
 @app.callback()
 def main_callback() -> None:
     """Inspect performance metrics, compare benchmarks, and export summaries."""
@@ -38,41 +88,11 @@ def main_callback() -> None:
 
 @app.command("performance")
 def performance_command(
-    sources: Optional[List[SourceKind]] = typer.Argument(  # type: ignore[arg-type]
-        None,
-        case_sensitive=False,
-        help="Portfolio sources to include (savvytrader fidelity). Defaults to both.",
-    ),
-    savvy_json: Path = typer.Option(
-        JSON_FILE_PATH,
-        "--savvy-json",
-        file_okay=True,
-        dir_okay=False,
-        readable=True,
-        help="Path to SavvyTrader valuations JSON file.",
-        show_default=True,
-    ),
-    fidelity_csv: Path = typer.Option(
-        FIDELITY_CSV_PATH,
-        "--fidelity-csv",
-        file_okay=True,
-        dir_okay=False,
-        readable=True,
-        help="Path to Fidelity investment income CSV export.",
-        show_default=True,
-    ),
-    annual_rf: float = typer.Option(
-        ANNUAL_RF_RATE,
-        "--rf",
-        min=0.0,
-        help="Annual risk-free rate used for Sharpe/Sortino calculations (e.g., 0.04).",
-        show_default=True,
-    ),
-    year: Optional[int] = typer.Option(
-        None,
-        "--year",
-        help="Calendar year to use for YTD performance (defaults to the current year).",
-    ),
+    sources: Optional[List[SourceKind]] = _SOURCES_ARGUMENT,  # type: ignore[arg-type]
+    savvy_json: Path = _SAVVY_JSON_OPTION,
+    fidelity_csv: Path = _FIDELITY_CSV_OPTION,
+    annual_rf: float = _RF_OPTION,
+    year: Optional[int] = _YEAR_OPTION,
     benchmarks: bool = typer.Option(
         True,
         "--benchmarks/--no-benchmarks",
@@ -82,8 +102,15 @@ def performance_command(
 ) -> None:
     """Display monthly returns and summary metrics for selected portfolios."""
 
+    import numpy as np
+    from rich import box
+    from rich.table import Table
+
+    from portfolio_cli.performance import collect_performance_data
+    from portfolio_cli.report import percent_cells
+
     current_year = year or datetime.now().year
-    console = Console()
+    console = _get_console()
 
     bundle = collect_performance_data(
         sources=sources,
@@ -102,10 +129,6 @@ def performance_command(
 
     combined = bundle.combined
     recent = bundle.recent if not bundle.recent.empty else combined
-    metrics_map = bundle.metrics
-
-    def fmt_pct(value: float | None) -> str:
-        return f"{value * 100:.1f}%" if value is not None else "—"
 
     returns_table = Table(title="Monthly Returns · last 12 months", box=box.MINIMAL_DOUBLE_HEAD, show_lines=False)
     returns_table.add_column("Month", style="bold")
@@ -113,10 +136,9 @@ def performance_command(
     for name in columns:
         returns_table.add_column(name, justify="right")
 
-    for month, row in recent.iterrows():
-        month_label = str(month)
-        formatted_row = [fmt_pct(row[col]) if pd.notna(row[col]) else "—" for col in columns]
-        returns_table.add_row(month_label, *formatted_row)
+    # Format the whole block at once instead of boxing each row with iterrows().
+    for month, formatted_row in zip(recent.index, percent_cells(recent[columns])):
+        returns_table.add_row(str(month), *formatted_row)
 
     console.print(returns_table)
     console.print()
@@ -126,28 +148,19 @@ def performance_command(
     for name in columns:
         metrics_table.add_column(name, justify="right")
 
-    metric_rows = [
-        ("CAGR", lambda m: m.metrics.cagr),
-        ("YTD", lambda m: m.metrics.ytd),
-        ("Max Drawdown", lambda m: m.metrics.max_dd_monthly),
-        ("Sharpe", lambda m: m.metrics.sharpe, True),
-        ("Sortino", lambda m: m.metrics.sortino, True),
-    ]
-
-    for label, getter, *rest in metric_rows:
-        is_ratio = rest[0] if rest else False
-        row_values = []
-        for name in columns:
-            metrics = metrics_map.get(name)
-            if metrics is None:
-                row_values.append("—")
-                continue
-            value = getter(metrics)
-            if value is None:
-                row_values.append("—")
-            else:
-                row_values.append(f"{value:.1f}" if is_ratio else fmt_pct(value))
-        metrics_table.add_row(label, *row_values)
+    # (label, PerformanceMetrics attribute, is_ratio); each row is formatted as one array.
+    metric_fields = (
+        ("CAGR", "cagr", False),
+        ("YTD", "ytd", False),
+        ("Max Drawdown", "max_dd_monthly", False),
+        ("Sharpe", "sharpe", True),
+        ("Sortino", "sortino", True),
+    )
+    matrix = bundle.metric_matrix
+    for label, attr, is_ratio in metric_fields:
+        values = matrix[attr]
+        text = np.char.mod("%.1f", values) if is_ratio else np.char.mod("%.1f%%", values * 100)
+        metrics_table.add_row(label, *np.where(np.isnan(values), "—", text).tolist())
 
     console.print(metrics_table)
 
@@ -170,41 +183,11 @@ def report_command(
         help="Destination HTML file for the report.",
         show_default=True,
     ),
-    sources: Optional[List[SourceKind]] = typer.Argument(  # type: ignore[arg-type]
-        None,
-        case_sensitive=False,
-        help="Portfolio sources to include (savvytrader fidelity). Defaults to both.",
-    ),
-    savvy_json: Path = typer.Option(
-        JSON_FILE_PATH,
-        "--savvy-json",
-        file_okay=True,
-        dir_okay=False,
-        readable=True,
-        help="Path to SavvyTrader valuations JSON file.",
-        show_default=True,
-    ),
-    fidelity_csv: Path = typer.Option(
-        FIDELITY_CSV_PATH,
-        "--fidelity-csv",
-        file_okay=True,
-        dir_okay=False,
-        readable=True,
-        help="Path to Fidelity investment income CSV export.",
-        show_default=True,
-    ),
-    annual_rf: float = typer.Option(
-        ANNUAL_RF_RATE,
-        "--rf",
-        min=0.0,
-        help="Annual risk-free rate used for Sharpe/Sortino calculations (e.g., 0.04).",
-        show_default=True,
-    ),
-    year: Optional[int] = typer.Option(
-        None,
-        "--year",
-        help="Calendar year to use for YTD performance (defaults to the current year).",
-    ),
+    sources: Optional[List[SourceKind]] = _SOURCES_ARGUMENT,  # type: ignore[arg-type]
+    savvy_json: Path = _SAVVY_JSON_OPTION,
+    fidelity_csv: Path = _FIDELITY_CSV_OPTION,
+    annual_rf: float = _RF_OPTION,
+    year: Optional[int] = _YEAR_OPTION,
     benchmarks: bool = typer.Option(
         True,
         "--benchmarks/--no-benchmarks",
@@ -219,8 +202,11 @@ def report_command(
 ) -> None:
     """Generate an HTML report covering the selected portfolios."""
 
+    from portfolio_cli.performance import collect_performance_data
+    from portfolio_cli.report import render_html_report
+
     current_year = year or datetime.now().year
-    console = Console()
+    console = _get_console()
 
     bundle = collect_performance_data(
         sources=sources,
@@ -239,7 +225,7 @@ def report_command(
 
     html = render_html_report(bundle, title=title)
     output.parent.mkdir(parents=True, exist_ok=True)
-    output.write_text(html, encoding="utf-8")
+    output.write_bytes(html.encode("utf-8"))
 
     console.print(f"[green]Report written to {output}[/green]")
     if bundle.missing:
@@ -307,6 +293,8 @@ def web_command(
 def interactive_command() -> None:
     """Launch the interactive shell."""
 
+    from portfolio_cli.shell import start_shell
+
     start_shell(app)
 
 
@@ -314,6 +302,8 @@ def run() -> None:
     """Run the CLI."""
 
     if len(sys.argv) <= 1:
+        from portfolio_cli.shell import start_shell
+
         start_shell(app)
     else:
         app()
@@ -0,0 +1,36 @@
+"""Lightweight defaults shared by the CLI parser and the analytics modules.
+
+Kept free of pandas/numpy imports so that building the Typer command tree (``--help``,
+tab completion) does not pay for the analytics stack.
+"""
+
+from __future__ import annotations
+
+from enum import Enum
+from pathlib import Path
+from typing import Tuple
+
+
+JSON_FILE_PATH = Path("data/valuations.json")
+FIDELITY_CSV_PATH = Path("data/private/fidelity-performance.csv")
+ANNUAL_RF_RATE = 0.04
+
+
+class SourceKind(str, Enum):
+    SAVVYTRADER = "savvytrader"
+    FIDELITY = "fidelity"
+
+    @property
+    def default_path(self) -> Path:
+        return _DEFAULT_PATHS[self]
+
+    @property
+    def label(self) -> str:
+        return _LABELS[self]
+
+
+# Plain lookups; defined after the Enum so they are not turned into members.
+_DEFAULT_PATHS = {SourceKind.SAVVYTRADER: JSON_FILE_PATH, SourceKind.FIDELITY: FIDELITY_CSV_PATH}
+_LABELS = {SourceKind.SAVVYTRADER: "SavvyTrader", SourceKind.FIDELITY: "Fidelity"}
+
+SUPPORTED_SOURCES: Tuple[str, ...] = tuple(kind.value for kind in SourceKind)
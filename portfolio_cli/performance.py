@@ -2,41 +2,28 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from enum import Enum
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+from datetime import date
+from functools import lru_cache, reduce
+from operator import attrgetter
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
-from benchmarks import configured_benchmarks, get_benchmark_series
+from benchmarks import configured_benchmarks, ensure_benchmark_cache, get_benchmark_series_many
 from portfolio_cli.analysis import (
-    ANNUAL_RF_RATE,
-    FIDELITY_CSV_PATH,
-    JSON_FILE_PATH,
     PerformanceMetrics,
     PortfolioAnalysis,
     calculate_metrics,
-    run_portfolio_analysis,
+    load_monthly_returns,
 )
+from portfolio_cli.defaults import ANNUAL_RF_RATE, SUPPORTED_SOURCES, SourceKind  # noqa: F401
 
 
-class SourceKind(str, Enum):
-    SAVVYTRADER = "savvytrader"
-    FIDELITY = "fidelity"
-
-    @property
-    def default_path(self) -> Path:
-        if self is SourceKind.SAVVYTRADER:
-            return JSON_FILE_PATH
-        return FIDELITY_CSV_PATH
-
-    @property
-    def label(self) -> str:
-        return "SavvyTrader" if self is SourceKind.SAVVYTRADER else "Fidelity"
-
-
-SUPPORTED_SOURCES: Tuple[str, ...] = tuple(kind.value for kind in SourceKind)
+METRIC_FIELDS: Tuple[str, ...] = ("cagr", "ytd", "max_dd_monthly", "sharpe", "sortino")
 
 
 @dataclass
@@ -46,6 +33,22 @@ class PerformanceBundle:
     metrics: Dict[str, PortfolioAnalysis]
     missing: List[str]
     last_period: Optional[pd.Period]
+    # One array per METRIC_FIELDS entry, aligned with combined.columns (NaN where unknown).
+    metric_matrix: Dict[str, np.ndarray] = field(default_factory=dict)
+
+
+def build_metric_matrix(
+    metrics: Dict[str, PortfolioAnalysis], columns: Iterable[str]
+) -> Dict[str, np.ndarray]:
+    """Lay the per-column metrics out as one float array per metric name."""
+    # Pull all fields per column in one attrgetter call, then transpose into per-metric rows.
+    fields = attrgetter(*METRIC_FIELDS)
+    missing_row = (None,) * len(METRIC_FIELDS)
+    rows = [fields(metrics[name].metrics) if name in metrics else missing_row for name in columns]
+    if not rows:
+        return {attr: np.empty(0) for attr in METRIC_FIELDS}
+    table = np.array(rows, dtype=float)  # None becomes NaN
+    return {attr: table[:, i] for i, attr in enumerate(METRIC_FIELDS)}
 
 
 def _ensure_period_index(series: pd.Series) -> pd.Series:
@@ -56,6 +59,13 @@ def _ensure_period_index(series: pd.Series) -> pd.Series:
     raise ValueError("Series must be indexed by period or datetime")
 
 
+def _scatter_to_ordinals(series: pd.Series, ordinals: np.ndarray) -> np.ndarray:
+    """Place ``series`` values at their month positions within sorted ``ordinals``."""
+    values = np.full(len(ordinals), np.nan)
+    values[np.searchsorted(ordinals, series.index.asi8)] = series.to_numpy(dtype=float)
+    return values
+
+
 def collect_performance_data(
     sources: Optional[Iterable[SourceKind]] = None,
     savvy_json: Path | None = None,
@@ -63,30 +73,98 @@ def collect_performance_data(
     annual_rf: float = ANNUAL_RF_RATE,
     current_year: Optional[int] = None,
     include_benchmarks: bool = True,
+    include_metrics: bool = True,
 ) -> PerformanceBundle:
+    """Load the requested sources (plus benchmarks) into one monthly-returns bundle.
+
+    Pass ``include_metrics=False`` when only the returns are rendered; ``bundle.metrics`` is
+    then left empty and no Sharpe/Sortino/CAGR work is done.
+    """
     if current_year is None:
         current_year = pd.Timestamp.today().year
 
     requested = list(dict.fromkeys(sources or [SourceKind.SAVVYTRADER, SourceKind.FIDELITY]))
+    overrides = {SourceKind.SAVVYTRADER: savvy_json, SourceKind.FIDELITY: fidelity_csv}
+    paths = tuple((src, Path(overrides.get(src) or src.default_path)) for src in requested)
+
+    # Repeated calls (e.g. from the interactive shell) reuse the previous result while the
+    # input files are unchanged; the date is part of the key so benchmarks roll over.
+    bundle = _collect_cached(
+        paths,
+        tuple(_file_stamp(path) for _, path in paths),
+        annual_rf,
+        current_year,
+        include_benchmarks,
+        include_metrics,
+        configured_benchmarks() if include_benchmarks else (),
+        date.today(),
+    )
+    if any(note.startswith("benchmark ") for note in bundle.missing):
+        # A failed benchmark fetch must not stick for the rest of the day: drop the cached
+        # bundles so the next call retries (lru_cache cannot evict a single key).
+        _collect_cached.cache_clear()
+    return replace(
+        bundle,
+        combined=bundle.combined.copy(deep=False),
+        recent=bundle.recent.copy(deep=False),
+        metrics=dict(bundle.metrics),
+        missing=list(bundle.missing),
+        metric_matrix=dict(bundle.metric_matrix),
+    )
+
+
+def _file_stamp(path: Path) -> Tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=8)
+def _collect_cached(
+    source_paths: Tuple[Tuple[SourceKind, Path], ...],
+    _stamps: Tuple[Tuple[int, int] | None, ...],
+    annual_rf: float,
+    current_year: int,
+    include_benchmarks: bool,
+    include_metrics: bool,
+    symbols: Tuple[str, ...],
+    _today: date,
+) -> PerformanceBundle:
+    requested = [src for src, _ in source_paths]
+    paths = dict(source_paths)
 
     monthly_map: Dict[str, pd.Series] = {}
     metrics_map: Dict[str, PortfolioAnalysis] = {}
     missing: List[str] = []
 
-    for src in requested:
-        path = src.default_path
-        if src is SourceKind.SAVVYTRADER and savvy_json is not None:
-            path = savvy_json
-        if src is SourceKind.FIDELITY and fidelity_csv is not None:
-            path = fidelity_csv
+    def analyze(src: SourceKind) -> pd.Series:
+        return _ensure_period_index(load_monthly_returns(src.value, paths[src]))
 
+    # Sources are parsed in parallel (file reads and pandas parsing release the GIL). Benchmark
+    # downloads are network-bound, so as soon as the first source's months are known the
+    # benchmark cache is warmed in the background while the remaining sources finish.
+    outcomes: Dict[SourceKind, Future] = {}
+    if len(requested) == 1:
+        single: Future = Future()
         try:
-            analysis = run_portfolio_analysis(
-                source=src.value,
-                input_path=path,
-                annual_rf=annual_rf,
-                current_year=current_year,
-            )
+            single.set_result(analyze(requested[0]))
+        except Exception as exc:  # surfaced below alongside the threaded path
+            single.set_exception(exc)
+        outcomes[requested[0]] = single
+    else:
+        with ThreadPoolExecutor(max_workers=len(requested) + 1) as executor:
+            outcomes = {src: executor.submit(analyze, src) for src in requested}
+            prefetch: Optional[Future] = None
+            for done in as_completed(outcomes.values()):
+                if include_benchmarks and prefetch is None and done.exception() is None:
+                    prefetch = executor.submit(ensure_benchmark_cache, symbols, done.result().index)
+
+    for src in requested:
+        path = paths[src]
+        try:
+            monthly_series = outcomes[src].result()
         except FileNotFoundError:
             missing.append(f"{src.label} (missing file: {path})")
             continue
@@ -94,29 +172,39 @@ def collect_performance_data(
             missing.append(f"{src.label} ({err})")
             continue
 
-        monthly_series = _ensure_period_index(analysis.monthly_returns)
         monthly_map[src.label] = monthly_series
-        metrics_map[src.label] = PortfolioAnalysis(monthly_returns=monthly_series, metrics=analysis.metrics)
-
-    combined = pd.DataFrame(monthly_map)
-    combined.index = combined.index.sort_values()
+        if include_metrics:
+            metrics = calculate_metrics(monthly_series, annual_rf, current_year)
+            metrics_map[src.label] = PortfolioAnalysis(
+                monthly_returns=monthly_series, metrics=metrics
+            )
 
-    months_index = combined.index
-    if months_index.empty and monthly_map:
-        months_index = pd.concat(monthly_map.values()).sort_index().index
+    # Work on the int64 month ordinals: np.union1d yields the sorted union directly, and each
+    # source is scattered into place by position instead of hash-aligning Period labels.
+    ordinals = reduce(
+        np.union1d,
+        (s.index.asi8 for s in monthly_map.values()),
+        np.empty(0, dtype=np.int64),
+    )
+    months_index = pd.PeriodIndex(pd.arrays.PeriodArray(ordinals, dtype=pd.PeriodDtype("M")))
 
+    # Gather every column first and build the frame once on the shared (sorted) index.
+    columns: Dict[str, np.ndarray] = {
+        label: _scatter_to_ordinals(series, ordinals) for label, series in monthly_map.items()
+    }
     if include_benchmarks and len(months_index) > 0:
-        for symbol in configured_benchmarks():
-            series = get_benchmark_series(symbol, months_index)
+        benchmark_map = get_benchmark_series_many(symbols, months_index)
+        for symbol, series in benchmark_map.items():
             if series.empty:
                 missing.append(f"benchmark {symbol} (no data)")
                 continue
             series = series.reindex(months_index)
-            combined[symbol] = series
-            metrics = calculate_metrics(series.dropna(), annual_rf, current_year)
-            metrics_map[symbol] = PortfolioAnalysis(monthly_returns=series, metrics=metrics)
+            columns[symbol] = series.to_numpy(dtype=float)
+            if include_metrics:
+                metrics = calculate_metrics(series.dropna(), annual_rf, current_year)
+                metrics_map[symbol] = PortfolioAnalysis(monthly_returns=series, metrics=metrics)
 
-    combined = combined.sort_index()
+    combined = pd.DataFrame(columns, index=months_index)
     recent = combined.tail(12)
 
     last_period = None
@@ -130,4 +218,5 @@ def collect_performance_data(
         metrics=metrics_map,
         missing=missing,
         last_period=last_period,
+        metric_matrix=build_metric_matrix(metrics_map, combined.columns),
     )
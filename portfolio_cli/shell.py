@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import cmd
+import importlib
 import os
 import shlex
 import sys
@@ -13,7 +14,28 @@ import typer
 
 from typer.main import get_command
 
-from portfolio_cli.performance import SUPPORTED_SOURCES
+from portfolio_cli.defaults import SUPPORTED_SOURCES
+
+_PERFORMANCE_FLAGS = (
+    "--savvy-json",
+    "--fidelity-csv",
+    "--rf",
+    "--year",
+    "--benchmarks",
+    "--no-benchmarks",
+)
+_REPORT_FLAGS = ("--output", "--title", *_PERFORMANCE_FLAGS)
+
+# Modules refreshed by `reload`, dependencies first. The shell module itself is left alone
+# because the running PortfolioShell instance belongs to it; a plain `reload` picks those up.
+_RELOAD_ORDER = (
+    "portfolio_cli.defaults",
+    "portfolio_cli.analysis",
+    "portfolio_cli.performance",
+    "portfolio_cli.report",
+    "portfolio_cli.cli",
+    "portfolio_cli",
+)
 
 
 class PortfolioShell(cmd.Cmd):
@@ -28,6 +50,7 @@ class PortfolioShell(cmd.Cmd):
         super().__init__()
         self._typer_app = typer_app
         self._click_app = get_command(self._typer_app)
+        self._command_cache: dict[str, click.Command | None] = {}
         if commands is not None:
             self.cmdqueue = list(commands)
 
@@ -48,50 +71,45 @@ class PortfolioShell(cmd.Cmd):
                 typer.echo(f"Command exited with status {exc.code}")
 
     def _show_command_help(self, command_name: str) -> None:
-        ctx = click.Context(self._click_app)
-        command = self._click_app.get_command(ctx, command_name)
+        try:
+            command = self._command_cache[command_name]
+        except KeyError:
+            ctx = click.Context(self._click_app)
+            command = self._click_app.get_command(ctx, command_name)
+            self._command_cache[command_name] = command
         if command is None:
             typer.echo(f"Unknown command: {command_name}")
             return
         with click.Context(command) as sub_ctx:
             typer.echo(command.get_help(sub_ctx))
 
-    # ---------- commands ------------------------------------------------
-    def do_performance(self, arg: str) -> bool | None:
-        """Show portfolio performance. Usage: performance [sources] [options]"""
-
-        parsed = shlex.split(arg)
-        self._run_cli(["performance", *parsed])
-        return None
-
-    def complete_performance(self, text: str, line: str, begidx: int, endidx: int):
-        try:
-            tokens = shlex.split(line[:begidx])
-        except ValueError:
-            tokens = line[:begidx].split()
-
-        flags = [
-            "--savvy-json",
-            "--fidelity-csv",
-            "--rf",
-            "--year",
-            "--benchmarks",
-            "--no-benchmarks",
-        ]
+    @staticmethod
+    def _complete_args(text: str, prefix: str, flags: tuple[str, ...]) -> list[str]:
+        # Completion tokens are bare flag/source names, so a whitespace split is enough;
+        # shlex would only add quote handling on every Tab press.
+        tokens = prefix.split()
 
         if len(tokens) <= 1:
             if not text:
                 return list(SUPPORTED_SOURCES)
             return [src for src in SUPPORTED_SOURCES if src.startswith(text)]
 
-        if text.startswith("--"):
-            return [flag for flag in flags if flag.startswith(text)]
-
-        if tokens and tokens[-1] in SUPPORTED_SOURCES:
+        if text.startswith("--") or tokens[-1] in SUPPORTED_SOURCES:
             return [flag for flag in flags if flag.startswith(text)]
 
         return [src for src in SUPPORTED_SOURCES if src.startswith(text)]
 
+    # ---------- commands ------------------------------------------------
+    def do_performance(self, arg: str) -> bool | None:
+        """Show portfolio performance. Usage: performance [sources] [options]"""
+
+        parsed = shlex.split(arg)
+        self._run_cli(["performance", *parsed])
+        return None
+
+    def complete_performance(self, text: str, line: str, begidx: int, endidx: int):
+        return self._complete_args(text, line[:begidx], _PERFORMANCE_FLAGS)
+
     def help_performance(self) -> None:  # pragma: no cover - passthrough help
         self._show_command_help("performance")
 
@@ -103,34 +121,7 @@ class PortfolioShell(cmd.Cmd):
         return None
 
     def complete_report(self, text: str, line: str, begidx: int, endidx: int):
-        try:
-            tokens = shlex.split(line[:begidx])
-        except ValueError:
-            tokens = line[:begidx].split()
-
-        flags = [
-            "--output",
-            "--title",
-            "--savvy-json",
-            "--fidelity-csv",
-            "--rf",
-            "--year",
-            "--benchmarks",
-            "--no-benchmarks",
-        ]
-
-        if len(tokens) <= 1:
-            if not text:
-                return list(SUPPORTED_SOURCES)
-            return [src for src in SUPPORTED_SOURCES if src.startswith(text)]
-
-        if text.startswith("--"):
-            return [flag for flag in flags if flag.startswith(text)]
-
-        if tokens and tokens[-1] in SUPPORTED_SOURCES:
-            return [flag for flag in flags if flag.startswith(text)]
-
-        return [src for src in SUPPORTED_SOURCES if src.startswith(text)]
+        return self._complete_args(text, line[:begidx], _REPORT_FLAGS)
 
     def help_report(self) -> None:  # pragma: no cover - passthrough help
         self._show_command_help("report")
@@ -145,7 +136,19 @@ class PortfolioShell(cmd.Cmd):
         return None
 
     def do_reload(self, arg: str) -> bool | None:
-        """Reload the CLI by restarting the current Python process."""
+        """Reload the CLI by restarting the current Python process.
+
+        ``reload fast`` instead re-imports the portfolio_cli modules in place, skipping the
+        pandas/numpy start-up cost; it falls back to a restart if the re-import fails.
+        """
+
+        if arg.strip() == "fast":
+            typer.echo("Reloading CLI modules...")
+            try:
+                self._reload_modules()
+                return None
+            except Exception as exc:  # broken edit mid-reload; a fresh process reports it cleanly
+                typer.echo(f"In-place reload failed ({exc}); restarting...")
 
         typer.echo("Reloading CLI...")
         python = sys.executable
@@ -153,6 +156,19 @@ class PortfolioShell(cmd.Cmd):
         os.execv(python, args)
         return None
 
+    def _reload_modules(self) -> None:
+        for name in _RELOAD_ORDER:
+            module = sys.modules.get(name)
+            if module is not None:
+                importlib.reload(module)
+
+        package = sys.modules["portfolio_cli"]
+        for name in package._LAZY_EXPORTS:  # drop lazily cached names bound to old modules
+            package.__dict__.pop(name, None)
+        self._typer_app = sys.modules["portfolio_cli.cli"].app
+        self._click_app = get_command(self._typer_app)
+        self._command_cache.clear()
+
     def do_sources(self, arg: str) -> bool | None:
         """Describe supported portfolio data formats."""
 
@@ -173,7 +189,7 @@ class PortfolioShell(cmd.Cmd):
         typer.echo("  performance [sources]  Show monthly returns (e.g., performance fidelity)")
         typer.echo("  report [sources]       Generate HTML report")
         typer.echo("  sources                Show supported data formats and default files")
-        typer.echo("  reload                 Restart the CLI to pull in code changes")
+        typer.echo("  reload [fast]          Restart the CLI to pull in code changes")
         typer.echo("  help <command>       Show command-specific help")
         typer.echo("  exit                 Quit the shell")
         typer.echo("\nTyper CLI usage remains available via 'portfolio-cli <command>'.")
@@ -200,4 +216,11 @@ class PortfolioShell(cmd.Cmd):
 def start_shell(typer_app: typer.Typer, commands: Iterable[str] | None = None) -> None:
     """Launch the interactive shell."""
 
-    PortfolioShell(typer_app, commands=commands).cmdloop()
+    shell = PortfolioShell(typer_app)
+    if commands is not None:
+        # Scripted commands go straight to onecmd; readline, the intro and the prompt are only
+        # set up if the script leaves the shell open (i.e. does not end with ``exit``).
+        for line in commands:
+            if shell.onecmd(line):
+                return
+    shell.cmdloop()
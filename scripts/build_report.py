@@ -87,7 +87,7 @@ def main() -> int:
 
     html = render_html_report(bundle, title=args.title)
     args.output.parent.mkdir(parents=True, exist_ok=True)
-    args.output.write_text(html, encoding="utf-8")
+    args.output.write_bytes(html.encode("utf-8"))
     print(f"Report written to {args.output}")
     for note in bundle.missing:
         print(f"Note: {note}")
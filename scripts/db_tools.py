@@ -2,16 +2,42 @@ from __future__ import annotations
 
 import argparse
 import os
+import sqlite3
 import sys
 from pathlib import Path
 
-from scripts.crypto_db import get_passphrase, open_encrypted_db
+from scripts.crypto_db import SALT_META_KEY, SCHEMA_VERSION, get_passphrase, open_encrypted_db
 
 
 DB_PATH = Path("data/localdb.sqlite3")
 
 
+def _is_initialized(db_path: Path) -> bool:
+    """True when the DB already has the current schema and a KDF salt (no key derivation)."""
+    if not db_path.exists():
+        return False
+    try:
+        conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return False
+    try:
+        meta = dict(
+            conn.execute(
+                "SELECT key, value FROM meta WHERE key IN ('schema_version', ?)", (SALT_META_KEY,)
+            ).fetchall()
+        )
+    except sqlite3.Error:  # not a DB we created, or no meta table yet
+        return False
+    finally:
+        conn.close()
+    return meta.get("schema_version") == SCHEMA_VERSION and bool(meta.get(SALT_META_KEY))
+
+
 def cmd_init(verbose: bool) -> int:
+    if _is_initialized(DB_PATH):
+        if verbose:
+            print(f"Encrypted DB already initialized at {DB_PATH}")
+        return 0
     passphrase = get_passphrase()
     if not passphrase:
         print("No passphrase provided. Set MINGDOM_DB_PASSPHRASE or run interactively to enter one.", file=sys.stderr)
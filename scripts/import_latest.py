@@ -1,17 +1,24 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import os
 import shutil
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Iterable, Optional
 
 from typing import TYPE_CHECKING
 
+try:  # optional fast path; stdlib json is the fallback
+    import orjson
+except ImportError:  # pragma: no cover - depends on local environment
+    orjson = None
+
 if TYPE_CHECKING:  # only for static type checkers; avoids hard dependency at runtime
     from scripts.crypto_db import DBHandle
 
@@ -24,63 +31,66 @@ CANONICAL_FIDELITY = Path("data/private/fidelity-performance.csv")
 
 
 PARTIAL_SUFFIXES = (".crdownload", ".download", ".part", ".partial", ".tmp")
+# Allowed lead of a dump's latest summaryDate over its file mtime (time zones, clock skew).
+SUMMARY_DATE_SLACK = timedelta(days=1)
 
 
 @dataclass
 class Candidate:
     path: Path
     mtime: float
+    size: int = 0
+    # Latest summaryDate in a JSON candidate, filled in by pick_latest_json.
+    as_of: Optional[datetime] = None
 
 
-def is_valid_file(p: Path) -> bool:
-    if not p.is_file():
-        return False
-    if p.name.startswith("."):
+def is_valid_file(name: str, size: int) -> bool:
+    """Check a directory entry's name and (already stat'ed) size."""
+    if name.startswith("."):
         return False
-    if p.suffix.lower() not in (".json", ".csv"):
+    if Path(name).suffix.lower() not in (".json", ".csv"):
         return False
-    if any(p.name.endswith(sfx) for sfx in PARTIAL_SUFFIXES):
-        return False
-    try:
-        if p.stat().st_size == 0:
-            return False
-    except FileNotFoundError:
+    if any(name.endswith(sfx) for sfx in PARTIAL_SUFFIXES):
         return False
-    return True
+    return size > 0
 
 
 def list_candidates(root: Path, ext: str) -> list[Candidate]:
     files: list[Candidate] = []
-    for child in root.iterdir():
-        if child.is_file() and child.suffix.lower() == ext and is_valid_file(child):
+    # scandir reports the file type from the directory listing itself, so each candidate costs
+    # a single stat() whose result supplies both the size check and the mtime.
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.name.startswith(".") or not entry.name.lower().endswith(ext):
+                continue
             try:
-                mtime = child.stat().st_mtime
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                st = entry.stat(follow_symlinks=False)
             except FileNotFoundError:
                 continue
-            files.append(Candidate(path=child, mtime=mtime))
+            if is_valid_file(entry.name, st.st_size):
+                files.append(Candidate(path=Path(entry.path), mtime=st.st_mtime, size=st.st_size))
     return files
 
 
 def _max_summary_date(file: Path) -> Optional[datetime]:
     try:
-        with file.open("r", encoding="utf-8") as fh:
-            data = json.load(fh)
+        raw = file.read_bytes()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
         if not isinstance(data, list):
             return None
-        max_dt: Optional[datetime] = None
-        for item in data:
-            if not isinstance(item, dict):
-                continue
-            v = item.get("summaryDate")
-            if not v:
-                continue
+        # ISO-8601 dates order lexically, so only the largest string needs parsing; fall back
+        # to the next one down if it is malformed.
+        values = {
+            str(v) for item in data if isinstance(item, dict) and (v := item.get("summaryDate"))
+        }
+        for v in sorted(values, reverse=True):
             try:
-                dt = datetime.fromisoformat(str(v).replace("Z", "+00:00")).replace(tzinfo=None)
-            except Exception:
+                return datetime.fromisoformat(v.replace("Z", "+00:00")).replace(tzinfo=None)
+            except ValueError:
                 continue
-            if max_dt is None or dt > max_dt:
-                max_dt = dt
-        return max_dt
+        return None
     except Exception:
         return None
 
@@ -88,14 +98,22 @@ def _max_summary_date(file: Path) -> Optional[datetime]:
 def pick_latest_json(cands: Iterable[Candidate]) -> Optional[Candidate]:
     if not cands:
         return None
-    scored: list[tuple[datetime, float, str, Candidate]] = []
-    for c in cands:
-        as_of = _max_summary_date(c.path)
-        key_dt = as_of or datetime.fromtimestamp(c.mtime)
-        scored.append((key_dt, c.mtime, c.path.name, c))
-    # Sort by (date desc, mtime desc, name desc)
-    scored.sort(key=lambda t: (t[0], t[1], t[2]))
-    return scored[-1][3]
+    # Rank by (date, mtime, name), parsing newest files first. A dump cannot hold valuations
+    # dated much after it was written, so once a file's mtime is more than SUMMARY_DATE_SLACK
+    # older than the best parsed summaryDate, it and every older file would lose: stop there.
+    # (If no summaryDate has parsed yet, keep scanning.)
+    best_key: Optional[tuple[datetime, float, str]] = None
+    best: Optional[Candidate] = None
+    for c in sorted(cands, key=lambda c: (c.mtime, c.path.name), reverse=True):
+        modified = datetime.fromtimestamp(c.mtime)
+        if best is not None and best.as_of is not None:
+            if modified < best.as_of - SUMMARY_DATE_SLACK:
+                break
+        c.as_of = _max_summary_date(c.path)
+        key = (c.as_of or modified, c.mtime, c.path.name)
+        if best_key is None or key > best_key:
+            best_key, best = key, c
+    return best
 
 
 def pick_latest_csv(cands: Iterable[Candidate]) -> Optional[Candidate]:
@@ -106,29 +124,35 @@ def pick_latest_csv(cands: Iterable[Candidate]) -> Optional[Candidate]:
     return scored[-1][2]
 
 
-def sha256_hex(path: Path) -> str:
-    import hashlib
-
-    h = hashlib.sha256()
-    with path.open("rb") as fh:
-        for chunk in iter(lambda: fh.read(1 << 20), b""):
-            h.update(chunk)
-    return h.hexdigest()
-
-
 def atomic_copy(src: Path, dst: Path, dry_run: bool = False) -> None:
     dst.parent.mkdir(parents=True, exist_ok=True)
     if dry_run:
         return
     import tempfile
 
-    with src.open("rb") as fh:
-        with tempfile.NamedTemporaryFile("wb", delete=False, dir=str(dst.parent)) as tmp:
-            shutil.copyfileobj(fh, tmp)
-            tmp_path = Path(tmp.name)
+    with tempfile.NamedTemporaryFile("wb", delete=False, dir=str(dst.parent)) as tmp:
+        tmp_path = Path(tmp.name)
+    # copyfile keeps the bytes in the kernel where it can (sendfile/copy_file_range on Linux,
+    # fcopyfile on macOS) and falls back to a buffered copy elsewhere.
+    shutil.copyfile(src, tmp_path)
     os.replace(tmp_path, dst)
 
 
+def _stage_file(
+    cand: Candidate, dest: Path, *, dry_run: bool, read: bool
+) -> tuple[Path, Optional[bytes]]:
+    """Copy ``cand`` to ``dest``, archive the original, and return ``(archive_path, content)``.
+
+    The content is only read (from the archived file) when ``read`` is set.
+    """
+    atomic_copy(cand.path, dest, dry_run=dry_run)
+    archive_path = archive_move(cand.path, ARCHIVE_DIR, dry_run=dry_run)
+    content = None
+    if read:
+        content = (cand.path if dry_run else archive_path).read_bytes()
+    return archive_path, content
+
+
 def archive_move(src: Path, archive_root: Path, dry_run: bool = False) -> Path:
     day = datetime.utcnow().strftime("%Y-%m-%d")
     dest_dir = archive_root / day
@@ -147,35 +171,49 @@ def archive_move(src: Path, archive_root: Path, dry_run: bool = False) -> Path:
         return dest
 
 
+_INSERT_FILE_SQL = """
+    INSERT INTO files(
+        source, original_name, path, sha256, size, mtime, imported_at, status, archive_path,
+        notes, content_cipher, content_nonce
+    )
+    VALUES(?,?,?,?,?,?,?,?,?,?,?,?)
+"""
+_UPSERT_RETURNING_SQL = "ON CONFLICT(sha256) DO UPDATE SET sha256 = excluded.sha256 RETURNING id"
+# RETURNING arrived in SQLite 3.35; older builds keep the INSERT OR IGNORE + SELECT pair.
+_SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
 def insert_file_row(db, *, source: str, original: Path, archive_path: Optional[Path], content_bytes: bytes) -> int:
     from scripts.crypto_db import encrypt_bytes, now_iso  # lazy import
 
     cipher, nonce = encrypt_bytes(db, content_bytes)
-    cur = db.conn.cursor()
+    # content_bytes is the file's content, so hash it in memory once rather than re-reading the
+    # file for each statement below.
+    digest = hashlib.sha256(content_bytes).hexdigest()
     meta = original.stat()
-    cur.execute(
-        """
-        INSERT OR IGNORE INTO files(source, original_name, path, sha256, size, mtime, imported_at, status, archive_path, notes, content_cipher, content_nonce)
-        VALUES(?,?,?,?,?,?,?,?,?,?,?,?)
-        """,
-        (
-            source,
-            original.name,
-            str(original),
-            sha256_hex(original),
-            meta.st_size,
-            meta.st_mtime,
-            now_iso(),
-            "archived" if archive_path else "imported",
-            str(archive_path) if archive_path else None,
-            None,
-            cipher,
-            nonce,
-        ),
+    params = (
+        source,
+        original.name,
+        str(original),
+        digest,
+        meta.st_size,
+        meta.st_mtime,
+        now_iso(),
+        "archived" if archive_path else "imported",
+        str(archive_path) if archive_path else None,
+        None,
+        cipher,
+        nonce,
     )
-    db.conn.commit()
+    cur = db.conn.cursor()
+    if _SQLITE_HAS_RETURNING:
+        # One statement: the no-op DO UPDATE makes RETURNING yield the existing id on a
+        # duplicate digest, where INSERT OR IGNORE would return nothing.
+        cur.execute(_INSERT_FILE_SQL + _UPSERT_RETURNING_SQL, params)
+        return int(cur.fetchone()[0])
+    cur.execute(_INSERT_FILE_SQL.replace("INSERT", "INSERT OR IGNORE", 1), params)
     # Retrieve row id (on duplicate ignore, fetch existing id)
-    cur.execute("SELECT id FROM files WHERE sha256 = ?", (sha256_hex(original),))
+    cur.execute("SELECT id FROM files WHERE sha256 = ?", (digest,))
     row = cur.fetchone()
     return int(row[0])
 
@@ -199,7 +237,6 @@ def insert_valuations_row(db, *, as_of_date: Optional[datetime], source: str, fi
             __import__("scripts.crypto_db", fromlist=["now_iso"]).now_iso(),
         ),
     )
-    db.conn.commit()
     return int(cur.lastrowid)
 
 
@@ -223,8 +260,9 @@ def run(args: argparse.Namespace) -> int:
     db_handle = None
     # Lazily import crypto only if needed
     try:
-        from scripts.crypto_db import get_passphrase, open_encrypted_db
+        from scripts.crypto_db import bulk_write, get_passphrase, open_encrypted_db
     except Exception:  # pragma: no cover - cryptography not installed yet
+        bulk_write = None  # type: ignore
         get_passphrase = None  # type: ignore
         open_encrypted_db = None  # type: ignore
 
@@ -240,54 +278,50 @@ def run(args: argparse.Namespace) -> int:
         if args.verbose:
             print("No passphrase provided; skipping DB ingestion.")
 
-    # Process JSON → valuations.json
-    if latest_json:
-        if args.verbose:
-            print(f"Copying {latest_json.path} -> {CANONICAL_JSON}")
-        atomic_copy(latest_json.path, CANONICAL_JSON, dry_run=args.dry_run)
-
-        archive_path = archive_move(latest_json.path, ARCHIVE_DIR, dry_run=args.dry_run)
-
-        if db_handle is not None:
-            # Use the archive path after move; in dry-run the original still exists.
-            file_for_db = archive_path if not args.dry_run else latest_json.path
-            # Payload for valuations row should reflect canonical file unless dry-run.
-            payload = CANONICAL_JSON.read_bytes() if not args.dry_run else latest_json.path.read_bytes()
-            as_of = _max_summary_date(file_for_db)
-            file_bytes = file_for_db.read_bytes()
-            file_id = insert_file_row(
-                db_handle,
-                source="savvytrader",
-                original=file_for_db,
-                archive_path=archive_path if not args.dry_run else None,
-                content_bytes=file_bytes,
-            )
-            insert_valuations_row(
-                db_handle,
-                as_of_date=as_of,
-                source="savvytrader",
-                file_id=file_id,
-                payload_bytes=payload,
-            )
-
-    # Process CSV → fidelity-performance.csv
-    if latest_csv:
-        if args.verbose:
-            print(f"Copying {latest_csv.path} -> {CANONICAL_FIDELITY}")
-        atomic_copy(latest_csv.path, CANONICAL_FIDELITY, dry_run=args.dry_run)
-
-        archive_path = archive_move(latest_csv.path, ARCHIVE_DIR, dry_run=args.dry_run)
-
-        if db_handle is not None:
-            file_for_db = archive_path if not args.dry_run else latest_csv.path
-            file_bytes = file_for_db.read_bytes()
-            insert_file_row(
-                db_handle,
-                source="fidelity",
-                original=file_for_db,
-                archive_path=archive_path if not args.dry_run else None,
-                content_bytes=file_bytes,
+    # The JSON and CSV are independent and their copy/archive/read steps are I/O-bound, so
+    # stage both on worker threads. SQLite inserts stay on this thread (one connection).
+    jobs = [
+        (source, cand, dest)
+        for source, cand, dest in (
+            ("savvytrader", latest_json, CANONICAL_JSON),
+            ("fidelity", latest_csv, CANONICAL_FIDELITY),
+        )
+        if cand
+    ]
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = []
+        for source, cand, dest in jobs:
+            if args.verbose:
+                print(f"Copying {cand.path} -> {dest}")
+            futures.append(
+                pool.submit(
+                    _stage_file, cand, dest, dry_run=args.dry_run, read=db_handle is not None
+                )
             )
+        staged = [future.result() for future in futures]
+
+    if db_handle is not None:
+        # All DB rows for this run share one transaction (a single WAL sync at the end).
+        with bulk_write(db_handle.conn):
+            for (source, cand, _), (archive_path, file_bytes) in zip(jobs, staged):
+                # Use the archive path after move; in dry-run the original still exists.
+                file_id = insert_file_row(
+                    db_handle,
+                    source=source,
+                    original=archive_path if not args.dry_run else cand.path,
+                    archive_path=archive_path if not args.dry_run else None,
+                    content_bytes=file_bytes,
+                )
+                if source == "savvytrader":
+                    # The canonical copy holds the same bytes, so the file content doubles as
+                    # the valuations payload; as_of was parsed once while picking.
+                    insert_valuations_row(
+                        db_handle,
+                        as_of_date=cand.as_of,
+                        source=source,
+                        file_id=file_id,
+                        payload_bytes=file_bytes,
+                    )
 
     if not latest_json and not latest_csv:
         print("No valid .json or .csv files found in data/import/.")
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Dict, Iterable
+from typing import Dict, Iterable, Tuple
 
 import pandas as pd
 
-from benchmarks import configured_benchmarks, get_benchmark_series, last_complete_month
+from benchmarks import configured_benchmarks, get_benchmark_series_many, last_complete_month
 from portfolio_cli.analysis import (
     ANNUAL_RF_RATE,
     JSON_FILE_PATH,
@@ -16,6 +16,12 @@ from portfolio_cli.analysis import (
 )
 
 
+# Benchmark metrics keyed by (symbol, month ordinals, annual_rf, current_year). The months are
+# all complete, so their cached returns never change and repeat comparisons skip the math.
+_BENCHMARK_METRICS: Dict[Tuple[str, bytes, float, int], PerformanceMetrics] = {}
+_BENCHMARK_METRICS_MAX = 256
+
+
 def convert_to_monthly_and_calculate_ratios(
     json_file: str = str(JSON_FILE_PATH),
     annual_rf: float = ANNUAL_RF_RATE,
@@ -36,11 +42,12 @@ def compute_metrics(monthly_returns: pd.Series, annual_rf: float, current_year:
 
 
 def _fmt_pct(value: float | None) -> str:
-    return f"{value * 100:.1f}%" if value is not None else "na"
+    # value == value is False only for NaN, so no pandas NA dispatch is needed.
+    return f"{value * 100:.1f}%" if value is not None and value == value else "na"
 
 
 def _fmt_val(value: float | None) -> str:
-    return f"{value:.1f}" if value is not None else "na"
+    return f"{value:.1f}" if value is not None and value == value else "na"
 
 
 def compare_with_benchmarks(portfolio_monthly: pd.Series, annual_rf: float, current_year: int):
@@ -50,6 +57,32 @@ def compare_with_benchmarks(portfolio_monthly: pd.Series, annual_rf: float, curr
     print(table)
 
 
+def _benchmark_metrics(
+    symbols: Iterable[str], months: pd.PeriodIndex, annual_rf: float, current_year: int
+) -> Dict[str, PerformanceMetrics]:
+    """Metrics per benchmark over ``months``, fetching and computing only uncached symbols."""
+
+    symbols = list(dict.fromkeys(symbols))
+    months_key = months.asi8.tobytes()
+    found: Dict[str, PerformanceMetrics] = {}
+    pending = []
+    for sym in symbols:
+        cached = _BENCHMARK_METRICS.get((sym, months_key, annual_rf, current_year))
+        if cached is None:
+            pending.append(sym)
+        else:
+            found[sym] = cached
+    if pending:
+        for sym, series in get_benchmark_series_many(pending, months).items():
+            found[sym] = calculate_metrics(series, annual_rf, current_year)
+            # An empty series usually means the fetch failed; let the next call retry it.
+            if not series.empty:
+                _BENCHMARK_METRICS[(sym, months_key, annual_rf, current_year)] = found[sym]
+        while len(_BENCHMARK_METRICS) > _BENCHMARK_METRICS_MAX:
+            del _BENCHMARK_METRICS[next(iter(_BENCHMARK_METRICS))]
+    return {sym: found[sym] for sym in symbols}
+
+
 def build_benchmark_comparison_table(
     portfolio_monthly: pd.Series,
     annual_rf: float,
@@ -58,19 +91,17 @@ def build_benchmark_comparison_table(
 ) -> str:
     """Return a formatted benchmark comparison table."""
 
-    lcm = last_complete_month().to_timestamp("M")
-    pm = portfolio_monthly.copy()
-    pm.index = pm.index.to_timestamp("M")
-    pm = pm[pm.index <= lcm]
-    months = pm.index.to_period("M")
+    # Compare in Period space; the monthly index never needs a Timestamp round-trip.
+    pm = portfolio_monthly[portfolio_monthly.index <= last_complete_month()]
+    months = pm.index
 
     metrics: Dict[str, PerformanceMetrics] = {
-        "Portfolio": calculate_metrics(pm.to_period("M"), annual_rf, current_year)
+        "Portfolio": calculate_metrics(pm, annual_rf, current_year)
     }
 
-    for sym in (symbols or configured_benchmarks()):
-        series = get_benchmark_series(sym, months)
-        metrics[sym] = calculate_metrics(series, annual_rf, current_year)
+    metrics.update(
+        _benchmark_metrics(symbols or configured_benchmarks(), months, annual_rf, current_year)
+    )
 
     lines = ["", "Comparison vs Benchmarks (rounded):"]
     header = f"{'Asset':<12} {'CAGR':>8} {'MaxDD(M)':>10} {'YTD':>8} {'Sharpe':>8} {'Sortino':>8}"
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
-import os
+import hashlib
 import io
+import os
+from datetime import date
+from operator import attrgetter
 from pathlib import Path
 from typing import Dict, Iterable
 
+import numpy as np
 import pandas as pd
 import streamlit as st
-import altair as alt
 
-from benchmarks import configured_benchmarks, get_benchmark_series
+from benchmarks import configured_benchmarks, get_benchmark_series_many
 from portfolio_cli.analysis import (
     ANNUAL_RF_RATE,
     FIDELITY_CSV_PATH,
@@ -17,42 +20,90 @@ from portfolio_cli.analysis import (
     calculate_metrics,
     load_fidelity_monthly_returns,
 )
+from portfolio_cli.report import percent_cells
+
+# Vega-Lite spec for the cumulative chart, written out directly so reruns skip building and
+# validating an Altair chart object.
+_CUMULATIVE_CHART_SPEC = {
+    "mark": "line",
+    "height": 320,
+    "encoding": {
+        "x": {"field": "Date", "type": "temporal", "axis": {"title": "Date"}},
+        "y": {
+            "field": "Return",
+            "type": "quantitative",
+            "axis": {"title": "Cumulative Return", "format": ".0%"},
+        },
+        "color": {"field": "Series", "type": "nominal", "title": "Series"},
+        "tooltip": [
+            {"field": "Date", "type": "temporal", "title": "Month"},
+            {"field": "Series", "type": "nominal", "title": "Series"},
+            {"field": "Return", "type": "quantitative", "title": "Cumulative", "format": ".2%"},
+        ],
+    },
+}
+
+
+# Summary table columns; the three percentages come first, then the two ratios.
+_SUMMARY_COLUMNS = ["CAGR", "YTD", "Max Drawdown", "Sharpe", "Sortino"]
+_SUMMARY_FIELDS = attrgetter("cagr", "ytd", "max_dd_monthly", "sharpe", "sortino")
 
 
 def _format_percentages(df: pd.DataFrame) -> pd.DataFrame:
-    def fmt(value: float | None) -> str:
-        if value is None or pd.isna(value):
-            return "—"
-        return f"{value * 100:.1f}%"
+    # One vectorized pass over the whole block (shared with the HTML report) instead of a
+    # Python callback per cell.
+    return pd.DataFrame(percent_cells(df), index=df.index, columns=df.columns)
 
-    return df.applymap(fmt)
+
+def _format_column_block(values: np.ndarray, pattern: str) -> np.ndarray:
+    return np.where(np.isnan(values), "—", np.char.mod(pattern, values))
 
 
 def _format_summary(metrics_map: Dict[str, PerformanceMetrics], ordered_columns: Iterable[str]) -> pd.DataFrame:
-    records = []
-    for name in ordered_columns:
-        metrics = metrics_map.get(name)
-        if metrics is None:
-            continue
-        records.append(
-            {
-                "Source": name,
-                "CAGR": metrics.cagr,
-                "YTD": metrics.ytd,
-                "Max Drawdown": metrics.max_dd_monthly,
-                "Sharpe": metrics.sharpe,
-                "Sortino": metrics.sortino,
-            }
-        )
-    df = pd.DataFrame(records)
-    if df.empty:
-        return df
-    percent_cols = ["CAGR", "YTD", "Max Drawdown"]
-    for col in percent_cols:
-        df[col] = df[col].apply(lambda x: f"{x * 100:.1f}%" if pd.notna(x) else "—")
-    for col in ["Sharpe", "Sortino"]:
-        df[col] = df[col].apply(lambda x: f"{x:.2f}" if pd.notna(x) else "—")
-    return df.set_index("Source")
+    names = [name for name in ordered_columns if metrics_map.get(name) is not None]
+    if not names:
+        return pd.DataFrame()
+    # One (sources x metrics) float block; None becomes NaN, which formats as "—".
+    table = np.array([_SUMMARY_FIELDS(metrics_map[name]) for name in names], dtype=float)
+    cells = np.hstack(
+        [
+            _format_column_block(table[:, :3] * 100, "%.1f%%"),
+            _format_column_block(table[:, 3:], "%.2f"),
+        ]
+    )
+    return pd.DataFrame(cells, index=pd.Index(names, name="Source"), columns=_SUMMARY_COLUMNS)
+
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def _cached_benchmarks(symbols: tuple[str, ...], months: tuple[str, ...]) -> Dict[str, pd.Series]:
+    """Benchmark returns for ``months`` ("YYYY-MM"), reused across reruns with the same inputs.
+
+    The TTL lets a failed (empty) fetch retry without restarting the app.
+    """
+    return get_benchmark_series_many(symbols, pd.PeriodIndex(months, freq="M"))
+
+
+@st.cache_data(show_spinner=False)
+def _cached_fidelity_returns(path: str, stamp: tuple[int, int]) -> pd.Series:
+    """Parse the Fidelity CSV once per (path, mtime, size); ``stamp`` is only the cache key."""
+    return load_fidelity_monthly_returns(Path(path))
+
+
+@st.cache_data(show_spinner=False)
+def _cached_upload_returns(digest: str, _data: bytes) -> pd.Series:
+    """Parse an uploaded CSV once per content ``digest`` (``_data`` is not hashed by Streamlit)."""
+    return load_fidelity_monthly_returns(io.BytesIO(_data))
+
+
+@st.cache_data(show_spinner=False)
+def _cached_metrics(
+    key: bytes, annual_rf: float, current_year: int, _series: pd.Series
+) -> PerformanceMetrics:
+    """``calculate_metrics`` memoized on ``key``: the raw bytes of the values and month ordinals.
+
+    Toggling back to a range (or rate) seen before reuses the result instead of recomputing.
+    """
+    return calculate_metrics(_series, annual_rf, current_year)
 
 
 def _ensure_period_index(df: pd.DataFrame) -> pd.DataFrame:
@@ -60,22 +111,26 @@ def _ensure_period_index(df: pd.DataFrame) -> pd.DataFrame:
         return df
     if isinstance(df.index, pd.PeriodIndex):
         return df
-    converted = df.copy()
-    converted.index = pd.PeriodIndex(df.index, freq="M")
-    return converted
+    # With Copy-on-Write (enabled in portfolio_cli.analysis) set_axis shares the column data,
+    # so only the index is rebuilt.
+    return df.set_axis(pd.PeriodIndex(df.index, freq="M"), axis=0)
 
 
-def _filter_range(df: pd.DataFrame, range_key: str, current_year: int) -> pd.DataFrame:
-    df = _ensure_period_index(df)
-    if df.empty:
-        return df
-    if range_key == "All":
-        return df
+def _range_rows(index: pd.PeriodIndex, range_key: str, current_year: int) -> slice:
+    """Positional rows of the (sorted) ``index`` covered by ``range_key``, for ``.iloc``.
+
+    Computed once per rerun and applied to both the returns and the cumulative frame.
+    """
+    if range_key == "All" or index.empty:
+        return slice(None)
     if range_key == "YTD":
-        filtered = df[df.index.year == current_year]
-        return filtered if not filtered.empty else df
+        # The year's months form one contiguous run; binary-search its bounds instead of
+        # building a year mask over the whole index.
+        year_start = pd.Period(year=current_year, month=1, freq="M")
+        start, stop = index.searchsorted([year_start, year_start + 12])
+        return slice(int(start), int(stop)) if stop > start else slice(None)
     periods = 3 if range_key == "3M" else 12
-    return df.tail(periods)
+    return slice(-periods, None)
 
 
 def main() -> None:
@@ -120,8 +175,8 @@ def main() -> None:
 
     if uploaded_file is not None:
         try:
-            csv_buffer = io.StringIO(uploaded_file.getvalue().decode("utf-8-sig"))
-            monthly_returns = load_fidelity_monthly_returns(csv_buffer)
+            data = uploaded_file.getvalue()
+            monthly_returns = _cached_upload_returns(hashlib.sha256(data).hexdigest(), data)
             source_note = f"Using uploaded file: {uploaded_file.name}"
         except Exception as exc:  # pragma: no cover - surfaced in UI
             st.error(f"Unable to parse uploaded CSV: {exc}")
@@ -130,7 +185,10 @@ def main() -> None:
         fidelity_path = Path(fidelity_path_input).expanduser()
         if fidelity_path_input:
             try:
-                monthly_returns = load_fidelity_monthly_returns(fidelity_path)
+                stat = fidelity_path.stat()
+                monthly_returns = _cached_fidelity_returns(
+                    str(fidelity_path), (stat.st_mtime_ns, stat.st_size)
+                )
                 source_note = f"Using file: {fidelity_path}"
             except FileNotFoundError:
                 missing.append(f"Fidelity (missing file: {fidelity_path})")
@@ -150,27 +208,35 @@ def main() -> None:
     if source_note:
         st.caption(source_note)
 
-    current_year = pd.Timestamp.today().year
+    current_year = date.today().year
     combined = pd.DataFrame({"Fidelity": monthly_returns})
 
     months_index = combined.index
 
     if include_benchmarks and not months_index.empty:
-        for symbol in configured_benchmarks():
-            series = get_benchmark_series(symbol, months_index)
+        benchmark_map = _cached_benchmarks(
+            configured_benchmarks(), tuple(pd.PeriodIndex(months_index, freq="M").strftime("%Y-%m"))
+        )
+        available: Dict[str, pd.Series] = {}
+        for symbol, series in benchmark_map.items():
             if series.empty:
                 missing.append(f"benchmark {symbol} (no data)")
                 continue
-            aligned = series.reindex(months_index)
-            combined[symbol] = aligned
+            available[symbol] = series
+        if available:
+            # Align all benchmarks to the Fidelity months in one frame and attach them with a
+            # single join, rather than one reindex plus column insert per symbol.
+            combined = combined.join(pd.DataFrame(available, index=months_index))
     combined = _ensure_period_index(combined)
 
-    filtered_returns = _filter_range(combined, range_choice, current_year)
+    range_rows = _range_rows(combined.index, range_choice, current_year)
+    filtered_returns = combined.iloc[range_rows]
 
     metrics_map: Dict[str, PerformanceMetrics] = {}
     for name in combined.columns:
-        series = filtered_returns[name].dropna() if name in filtered_returns else pd.Series(dtype=float)
-        metrics_map[name] = calculate_metrics(series, annual_rf, current_year)
+        series = filtered_returns[name].dropna()
+        key = series.to_numpy(dtype=float).tobytes() + series.index.asi8.tobytes()
+        metrics_map[name] = _cached_metrics(key, annual_rf, current_year, series)
 
     st.subheader("Monthly Returns")
     st.dataframe(_format_percentages(filtered_returns), width="stretch")
@@ -181,36 +247,38 @@ def main() -> None:
         st.dataframe(summary_df, width="stretch")
 
     st.subheader("Cumulative Performance")
-    cumulative = (1 + combined.fillna(0)).cumprod() - 1
-    cumulative_filtered = _filter_range(cumulative, range_choice, current_year)
+    # Only the selected months are charted, so fold the months before the range into one
+    # starting factor per column instead of compounding the whole history. The growth array
+    # is allocated once and updated in place from there.
+    growth = np.nan_to_num(combined.to_numpy(dtype=float), nan=0.0)
+    growth += 1
+    prior = growth[: range_rows.indices(len(growth))[0]].prod(axis=0)
+    selected = growth[range_rows]
+    np.cumprod(selected, axis=0, out=selected)
+    selected *= prior
+    selected -= 1
+    cumulative_filtered = pd.DataFrame(
+        selected, index=combined.index[range_rows], columns=combined.columns
+    )
     chart_df = cumulative_filtered.dropna(how="all")
     if chart_df.empty:
         st.info("Not enough data to render cumulative chart for the selected range.")
     else:
-        chart_df = chart_df.reset_index().rename(columns={"index": "Period"})
-        chart_df["Date"] = chart_df["Period"].dt.to_timestamp()
-        value_columns = [col for col in chart_df.columns if col not in {"Period", "Date"}]
-        long_df = chart_df.melt(id_vars="Date", value_vars=value_columns, var_name="Series", value_name="Return")
-        long_df = long_df.dropna(subset=["Return"])
+        # Long form straight from the array, column by column as melt() laid it out, with the
+        # gaps dropped by one mask instead of a melt copy plus a dropna copy.
+        values = chart_df.to_numpy(dtype=float).T
+        present = ~np.isnan(values).ravel()
+        long_df = pd.DataFrame(
+            {
+                "Date": np.tile(chart_df.index.to_timestamp().to_numpy(), values.shape[0])[present],
+                "Series": np.repeat(chart_df.columns.to_numpy(), values.shape[1])[present],
+                "Return": values.ravel()[present],
+            }
+        )
         if long_df.empty:
             st.info("Not enough data to render cumulative chart for the selected range.")
         else:
-            chart = (
-                alt.Chart(long_df)
-                .mark_line()
-                .encode(
-                    x=alt.X("Date:T", axis=alt.Axis(title="Date")),
-                    y=alt.Y("Return:Q", axis=alt.Axis(title="Cumulative Return", format=".0%")),
-                    color=alt.Color("Series:N", title="Series"),
-                    tooltip=[
-                        alt.Tooltip("Date:T", title="Month"),
-                        alt.Tooltip("Series:N", title="Series"),
-                        alt.Tooltip("Return:Q", title="Cumulative", format=".2%"),
-                    ],
-                )
-                .properties(height=320)
-            )
-            st.altair_chart(chart, use_container_width=True)
+            st.vega_lite_chart(long_df, _CUMULATIVE_CHART_SPEC, width="stretch")
 
     if missing:
         with st.expander("Notes"):
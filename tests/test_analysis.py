@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from portfolio_cli.analysis import calculate_monthly_returns
+
+
+def test_monthly_returns_compound_daily_changes():
+    df = pd.DataFrame(
+        {
+            "summaryDate": pd.to_datetime(
+                ["2024-01-02", "2024-01-03", "2024-01-04", "2024-02-01", "2024-02-02"]
+            ),
+            "dailyTotalValueChange": [0.01, -0.02, 0.0, 0.03, 0.01],
+        }
+    )
+
+    monthly = calculate_monthly_returns(df)
+
+    assert list(monthly.index.astype(str)) == ["2024-01", "2024-02"]
+    np.testing.assert_allclose(monthly.values, [1.01 * 0.98 - 1, 1.03 * 1.01 - 1])
+
+
+def _one_month(changes):
+    return pd.DataFrame(
+        {
+            "summaryDate": pd.date_range("2024-01-01", periods=len(changes), freq="D"),
+            "dailyTotalValueChange": changes,
+        }
+    )
+
+
+def test_monthly_returns_exact_for_total_and_larger_losses():
+    np.testing.assert_allclose(calculate_monthly_returns(_one_month([-1.0, 0.1])).values, [-1.0])
+    np.testing.assert_allclose(
+        calculate_monthly_returns(_one_month([-1.5, 0.1])).values, [-0.5 * 1.1 - 1]
+    )
+
+
+def test_monthly_returns_skip_missing_days():
+    monthly = calculate_monthly_returns(_one_month([0.1, np.nan, 0.2]))
+
+    np.testing.assert_allclose(monthly.values, [1.1 * 1.2 - 1])
+
+
+def test_metrics_compound_returns_at_or_below_minus_one():
+    from portfolio_cli.analysis import calculate_metrics
+
+    index = pd.period_range("2024-01", periods=3, freq="M")
+    metrics = calculate_metrics(pd.Series([0.1, -1.5, 0.2], index=index), 0.0, 2024)
+
+    assert metrics.ytd == np.float64(1.1 * -0.5 * 1.2 - 1)
+    wiped = calculate_metrics(pd.Series([0.1, -1.0, 0.2], index=index), 0.0, 2024)
+    assert wiped.ytd == -1.0
+    assert wiped.cagr == -1.0
+
+
+def test_metrics_skip_missing_months():
+    import warnings
+
+    from portfolio_cli.analysis import calculate_metrics
+
+    index = pd.period_range("2024-01", periods=4, freq="M")
+    metrics = calculate_metrics(pd.Series([0.01, np.nan, 0.02, -0.01], index=index), 0.0, 2024)
+
+    present = np.array([0.01, 0.02, -0.01])
+    growth = 1.01 * 1.02 * 0.99
+    # The gap is skipped in every reduction but still counts towards the four-month span.
+    assert metrics.cagr == pytest.approx(growth**3 - 1)
+    assert metrics.ytd == pytest.approx(growth - 1)
+    assert metrics.max_dd_monthly == -0.01
+    assert metrics.sharpe == pytest.approx(present.mean() / present.std(ddof=1) * np.sqrt(12))
+
+    empty = calculate_metrics(pd.Series([np.nan], index=index[:1]), 0.0, 2024)
+    assert empty.cagr is None and empty.sharpe is None
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        single = calculate_metrics(pd.Series([0.03], index=index[:1]), 0.0, 2024)
+    assert np.isnan(single.sharpe)
+    assert single.ytd == pytest.approx(0.03)
+
+
+def test_fidelity_amounts_handle_parentheses_and_dashes():
+    import io
+
+    from portfolio_cli.analysis import load_fidelity_monthly_returns
+
+    csv_text = (
+        '"Monthly","Beginning balance","Market change","Dividends","Interest",'
+        '"Deposits","Withdrawals","Net advisory fees","Ending balance"\n'
+        '"Jan 2024","$1,000.00","($20.00)","-","$0.00","$0.00","$0.00","$0.00","$980.00"\n'
+        '"Total"\n'
+    )
+
+    series = load_fidelity_monthly_returns(io.StringIO(csv_text))
+
+    assert list(series.index.astype(str)) == ["2024-01"]
+    np.testing.assert_allclose(series.values, [-0.02])
+
+
+def test_parsed_monthly_returns_are_cached_next_to_the_source(tmp_path, monkeypatch):
+    import json
+
+    from portfolio_cli import analysis
+
+    data_path = tmp_path / "valuations.json"
+    data_path.write_text(
+        json.dumps(
+            [
+                {"summaryDate": "2024-01-02", "dailyTotalValueChange": 0.01},
+                {"summaryDate": "2024-02-01", "dailyTotalValueChange": 0.02},
+            ]
+        )
+    )
+
+    first = analysis.run_portfolio_analysis(input_path=data_path, current_year=2024)
+    assert len(list((tmp_path / analysis.MONTHLY_CACHE_DIRNAME).glob("*.npz"))) == 1
+
+    def fail(_path):
+        raise AssertionError("source should not be re-parsed")
+
+    monkeypatch.setattr(analysis, "load_daily_changes", fail)
+    second = analysis.run_portfolio_analysis(input_path=data_path, current_year=2024)
+    pd.testing.assert_series_equal(first.monthly_returns, second.monthly_returns)
+
+
+def test_monthly_cache_replaces_only_its_own_stale_entries(tmp_path, monkeypatch):
+    import os
+    import pickle
+
+    from portfolio_cli import analysis
+
+    csv_path = tmp_path / "fidelity.csv"
+    csv_path.write_text(
+        '"Monthly","Beginning balance","Market change","Dividends","Interest",'
+        '"Deposits","Withdrawals","Net advisory fees","Ending balance"\n'
+        '"Jan 2024","$1,000.00","$20.00","$0.00","$0.00","$0.00","$0.00","$0.00","$1,020.00"\n'
+    )
+    cache_dir = tmp_path / analysis.MONTHLY_CACHE_DIRNAME
+    cache_dir.mkdir()
+    unrelated = [cache_dir / "other_tool.pkl", cache_dir / "other_tool.npz"]
+    for path in unrelated:
+        path.write_bytes(b"")
+    first = analysis.load_monthly_returns("fidelity", csv_path)
+    (entry,) = set(cache_dir.glob("*.npz")) - set(unrelated)
+    pd.testing.assert_series_equal(analysis.load_monthly_returns("fidelity", csv_path), first)
+
+    # An entry that needs unpickling is ignored and rewritten, never loaded.
+    entry.write_bytes(pickle.dumps(first))
+    pd.testing.assert_series_equal(analysis.load_monthly_returns("fidelity", csv_path), first)
+
+    stat = csv_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    analysis.load_monthly_returns("fidelity", csv_path)
+    assert not entry.exists()
+    assert len(list(cache_dir.glob("fidelity-*.npz"))) == 1
+    assert all(path.exists() for path in unrelated)
+
+    monkeypatch.setattr(analysis, "MONTHLY_CACHE_VERSION", analysis.MONTHLY_CACHE_VERSION + 1)
+    monkeypatch.setattr(analysis, "load_fidelity_monthly_returns", lambda _path: first * 2)
+    pd.testing.assert_series_equal(analysis.load_monthly_returns("fidelity", csv_path), first * 2)
+
+
+def test_load_daily_changes_mmap_path_matches_small_file(tmp_path, monkeypatch):
+    import json
+
+    from portfolio_cli import analysis
+
+    rows = [
+        {"summaryDate": f"2024-01-{day:02d}", "dailyTotalValueChange": day / 1000}
+        for day in range(1, 29)
+    ]
+    path = tmp_path / "valuations.json"
+    path.write_text(json.dumps(rows))
+
+    small = analysis.load_daily_changes(path)
+    monkeypatch.setattr(analysis, "MMAP_MIN_BYTES", 0)
+    mapped = analysis.load_daily_changes(path)
+
+    pd.testing.assert_frame_equal(small, mapped)
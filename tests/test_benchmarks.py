@@ -0,0 +1,232 @@
+import json
+
+import pandas as pd
+import pytest
+
+import benchmarks
+
+
+@pytest.fixture(autouse=True)
+def _fresh_fetch_memo(monkeypatch):
+    monkeypatch.setattr(benchmarks, "_FETCHED", {})
+
+
+def _monthly_download(symbols, start=None, end=None, **kwargs):
+    idx = pd.date_range("2024-01-01", periods=4, freq="MS")
+    frames = {
+        sym: pd.DataFrame({"Close": [100.0, 110.0, 121.0, 133.1]}, index=idx) for sym in symbols
+    }
+    return pd.concat(frames, axis=1)
+
+
+def test_ensure_benchmark_cache_batches_symbols(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_download(symbols, **kwargs):
+        calls.append(list(symbols))
+        return _monthly_download(symbols, **kwargs)
+
+    monkeypatch.setattr(benchmarks, "CACHE_PATH", tmp_path / "benchmarks.json")
+    monkeypatch.setattr(benchmarks.yf, "download", fake_download)
+
+    months = pd.period_range("2024-02", periods=3, freq="M")
+    cache = benchmarks.ensure_benchmark_cache(["SPY", "QQQ"], months)
+
+    assert calls == [["SPY", "QQQ"]]
+    for sym in ("SPY", "QQQ"):
+        assert sorted(cache[sym]) == ["2024-02", "2024-03", "2024-04"]
+        assert abs(cache[sym]["2024-03"] - 0.1) < 1e-9
+
+
+def test_ensure_aligned_partials_fetches_each_symbol(tmp_path, monkeypatch):
+    from datetime import date
+
+    def fake_partial(symbol, start_date, end_date):
+        return 0.01 if symbol == "SPY" else 0.02
+
+    monkeypatch.setattr(benchmarks, "CACHE_PATH", tmp_path / "benchmarks.json")
+    monkeypatch.setattr(benchmarks, "fetch_partial_return", fake_partial)
+
+    cache = benchmarks.ensure_aligned_partials(["SPY", "QQQ"], date(2024, 1, 15), date(2024, 3, 12))
+
+    aligned = cache["_aligned"]
+    assert aligned["SPY"]["2024-01"]["return"] == 0.01
+    assert aligned["SPY"]["2024-01"]["end"] == "2024-01-31"
+    assert aligned["QQQ"]["2024-03"] == {
+        "start": "2024-03-01",
+        "end": "2024-03-12",
+        "return": 0.02,
+        "as_of": "2024-03-12",
+    }
+
+
+def test_ensure_benchmark_cache_skips_write_when_warm(tmp_path, monkeypatch):
+    cache_path = tmp_path / "benchmarks.json"
+    cache_path.write_text('{"SPY": {"2024-02": 0.01}}')
+    monkeypatch.setattr(benchmarks, "CACHE_PATH", cache_path)
+    saved = []
+    monkeypatch.setattr(benchmarks, "_save_cache", saved.append)
+
+    cache = benchmarks.ensure_benchmark_cache(["SPY"], [pd.Period("2024-02", freq="M")])
+
+    assert cache["SPY"] == {"2024-02": 0.01}
+    assert saved == []
+
+
+def test_load_cache_reuses_parsed_file_until_it_changes(tmp_path, monkeypatch):
+    cache_path = tmp_path / "benchmarks.json"
+    cache_path.write_text('{"SPY": {"2024-02": 0.01}}')
+    monkeypatch.setattr(benchmarks, "CACHE_PATH", cache_path)
+
+    first = benchmarks._load_cache()
+    parsed = benchmarks._CACHE
+    second = benchmarks._load_cache()
+    assert benchmarks._CACHE is parsed
+    # Every caller gets its own copy, so filling one never shows up in another.
+    assert second == first and second is not first
+    first["SPY"]["2024-03"] = 0.05
+    first["QQQ"] = {}
+    assert benchmarks._load_cache() == {"SPY": {"2024-02": 0.01}}
+
+    saved = {"SPY": {"2024-02": 0.02}}
+    benchmarks._save_cache(saved)
+    saved["SPY"]["2024-03"] = 0.03
+    assert benchmarks._load_cache() == {"SPY": {"2024-02": 0.02}}
+
+
+def test_concurrent_cache_fills_and_saves_stay_consistent(tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache_path = tmp_path / "benchmarks.json"
+    cache_path.write_text('{"SPY": {}, "_aligned": {"SPY": {}}}')
+    monkeypatch.setattr(benchmarks, "CACHE_PATH", cache_path)
+    monkeypatch.setattr(benchmarks, "orjson", None)  # the pure-Python json.dumps path
+
+    def fill_and_save(worker):
+        for month in range(200):
+            cache = benchmarks._load_cache()
+            cache["SPY"][f"{worker}-{month}"] = 0.01
+            cache["_aligned"]["SPY"][f"{worker}-{month}"] = {"return": 0.01}
+            cache.setdefault("_meta", {})["last_updated"] = str(month)
+            benchmarks._save_cache(cache)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(fill_and_save, range(4)))
+
+    on_disk = json.loads(cache_path.read_text())
+    assert on_disk == benchmarks._load_cache()
+    assert len(on_disk["SPY"]) == len(on_disk["_aligned"]["SPY"]) >= 200
+
+
+def test_concurrent_identical_fetches_share_one_call():
+    import threading
+    import time
+
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "result"
+
+    results = []
+
+    def worker():
+        results.append(benchmarks._coalesced("k", slow_fetch))
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    threads[0].start()
+    started.wait(5)
+    for t in threads[1:]:
+        t.start()
+    time.sleep(0.1)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert results == ["result"] * 3
+    assert len(calls) == 1
+    assert benchmarks._INFLIGHT == {}
+
+
+def test_repeated_downloads_are_memoized_but_failures_are_not(monkeypatch):
+    calls = []
+
+    def fake_download(symbols, **kwargs):
+        calls.append(list(symbols))
+        if symbols == ["ARKK"]:
+            return pd.DataFrame()
+        return _monthly_download(symbols, **kwargs)
+
+    monkeypatch.setattr(benchmarks.yf, "download", fake_download)
+    start, end = pd.Period("2024-02", freq="M"), pd.Period("2024-04", freq="M")
+
+    first = benchmarks.fetch_monthly_returns_many(["SPY"], start, end)
+    second = benchmarks.fetch_monthly_returns_many(["SPY"], start, end)
+    benchmarks.fetch_monthly_returns_many(["ARKK"], start, end)
+    benchmarks.fetch_monthly_returns_many(["ARKK"], start, end)
+
+    assert calls == [["SPY"], ["ARKK"], ["ARKK"]]
+    pd.testing.assert_series_equal(first["SPY"], second["SPY"])
+
+
+def test_benchmark_series_only_include_cached_requested_months(tmp_path, monkeypatch):
+    cache_path = tmp_path / "benchmarks.json"
+    cache_path.write_text('{"SPY": {"2024-01": 0.01, "2024-02": 0.02, "2024-03": 0.03}}')
+    monkeypatch.setattr(benchmarks, "CACHE_PATH", cache_path)
+    monkeypatch.setattr(benchmarks.yf, "download", lambda *args, **kwargs: pd.DataFrame())
+
+    months = pd.PeriodIndex(["2024-03", "2024-02", "2023-12"], freq="M")
+    result = benchmarks.get_benchmark_series_many(["SPY", "QQQ"], months)
+
+    assert list(result["SPY"].index.astype(str)) == ["2024-02", "2024-03"]
+    assert list(result["SPY"]) == [0.02, 0.03]
+    assert result["QQQ"].empty
+
+
+def test_aligned_series_writes_cache_once(tmp_path, monkeypatch):
+    from datetime import date
+
+    monkeypatch.setattr(benchmarks, "CACHE_PATH", tmp_path / "benchmarks.json")
+    monkeypatch.setattr(benchmarks.yf, "download", _monthly_download)
+    monkeypatch.setattr(benchmarks, "fetch_partial_return", lambda *args: 0.05)
+    saves = []
+    real_save = benchmarks._save_cache
+    monkeypatch.setattr(benchmarks, "_save_cache", lambda cache: saves.append(real_save(cache)))
+
+    months = pd.period_range("2024-01", periods=4, freq="M")
+    series = benchmarks.get_aligned_benchmark_series(
+        "SPY", months, date(2024, 1, 15), date(2024, 4, 10)
+    )
+
+    assert len(saves) == 1
+    assert series["2024-01"] == 0.05 and series["2024-04"] == 0.05
+    assert abs(series["2024-02"] - 0.1) < 1e-9
+
+
+def test_partial_returns_use_a_fresh_ticker_per_fetch(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    from datetime import date
+
+    instances = []
+
+    class FakeTicker:
+        def __init__(self, symbol):
+            self.symbol = symbol
+            instances.append(self)
+
+        def history(self, start, end, **kwargs):
+            idx = pd.date_range(start, end - pd.Timedelta(days=1), freq="D")
+            return pd.DataFrame({"Close": range(100, 100 + len(idx))}, index=idx, dtype=float)
+
+    monkeypatch.setattr(benchmarks.yf, "Ticker", FakeTicker)
+    ranges = [(date(2024, 3, day), date(2024, 3, day + 4)) for day in range(1, 9)]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        returns = list(pool.map(lambda r: benchmarks.fetch_partial_return("SPY", *r), ranges))
+
+    assert len(instances) == len(ranges)
+    assert returns == pytest.approx([0.04] * len(ranges))
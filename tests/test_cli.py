@@ -73,11 +73,24 @@ def test_load_fidelity_monthly_returns(tmp_path):
     series = load_fidelity_monthly_returns(csv_file)
 
     assert list(series.index.astype(str)) == ["2024-01", "2024-02", "2024-03"]
+    assert series.index.name is None
     assert pytest.approx(series.iloc[0], rel=1e-6) == (-4.5 + 1.5) / 90
     assert pytest.approx(series.iloc[1], rel=1e-6) == (5 + 2 - 1) / 100
     assert pytest.approx(series.iloc[2], rel=1e-6) == 11 / 110
 
 
+def test_load_fidelity_monthly_returns_from_binary_buffer():
+    import io
+
+    buffer = io.BytesIO(b"\xef\xbb\xbf" + _fidelity_csv().encode("utf-8"))
+
+    series = load_fidelity_monthly_returns(buffer)
+
+    expected = load_fidelity_monthly_returns(io.StringIO(_fidelity_csv()))
+    assert series.equals(expected)
+    assert not buffer.closed
+
+
 def test_shell_runs_performance_command(tmp_path, capsys):
     data_path = tmp_path / "valuations.json"
     with data_path.open("w") as handle:
@@ -120,6 +133,133 @@ def test_cli_performance_fidelity(tmp_path):
     assert "Monthly Returns" in result.stdout
 
 
+def test_collect_performance_data_combines_sources_in_order(tmp_path):
+    from portfolio_cli.performance import SourceKind, collect_performance_data
+
+    data_path = tmp_path / "valuations.json"
+    data_path.write_text(json.dumps(_sample_data()))
+    csv_file = tmp_path / "fidelity.csv"
+    csv_file.write_text(_fidelity_csv())
+
+    bundle = collect_performance_data(
+        sources=[SourceKind.SAVVYTRADER, SourceKind.FIDELITY, SourceKind.FIDELITY],
+        savvy_json=data_path,
+        fidelity_csv=tmp_path / "missing.csv",
+        include_benchmarks=False,
+    )
+    assert list(bundle.combined.columns) == ["SavvyTrader"]
+    assert bundle.missing == [f"Fidelity (missing file: {tmp_path / 'missing.csv'})"]
+
+    bundle = collect_performance_data(
+        sources=[SourceKind.FIDELITY, SourceKind.SAVVYTRADER],
+        savvy_json=data_path,
+        fidelity_csv=csv_file,
+        include_benchmarks=False,
+    )
+    assert list(bundle.combined.columns) == ["Fidelity", "SavvyTrader"]
+    assert list(bundle.combined.index.astype(str)) == ["2024-01", "2024-02", "2024-03"]
+    assert set(bundle.metrics) == {"Fidelity", "SavvyTrader"}
+
+    returns_only = collect_performance_data(
+        sources=[SourceKind.FIDELITY],
+        fidelity_csv=csv_file,
+        include_benchmarks=False,
+        include_metrics=False,
+    )
+    assert returns_only.metrics == {}
+    assert list(returns_only.combined.columns) == ["Fidelity"]
+
+
+def test_collect_performance_data_reuses_result_until_file_changes(tmp_path, monkeypatch):
+    import os
+
+    from portfolio_cli import performance
+
+    data_path = tmp_path / "valuations.json"
+    data_path.write_text(json.dumps(_sample_data()))
+    calls = []
+    real_load = performance.load_monthly_returns
+
+    def counting_load(source, path):
+        calls.append(source)
+        return real_load(source, path)
+
+    monkeypatch.setattr(performance, "load_monthly_returns", counting_load)
+    performance._collect_cached.cache_clear()
+
+    def collect():
+        return performance.collect_performance_data(
+            sources=[performance.SourceKind.SAVVYTRADER],
+            savvy_json=data_path,
+            include_benchmarks=False,
+        )
+
+    first = collect()
+    second = collect()
+    assert calls == ["savvytrader"]
+    assert first.combined is not second.combined
+    assert first.combined.equals(second.combined)
+
+    stat = data_path.stat()
+    os.utime(data_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    collect()
+    assert calls == ["savvytrader", "savvytrader"]
+
+
+def test_collect_performance_data_retries_failed_benchmarks(tmp_path, monkeypatch):
+    import pandas as pd
+
+    from portfolio_cli import performance
+
+    data_path = tmp_path / "valuations.json"
+    data_path.write_text(json.dumps(_sample_data()))
+    calls = []
+
+    def flaky_benchmarks(symbols, months):
+        calls.append(tuple(symbols))
+        months = pd.PeriodIndex(list(months), freq="M")
+        if len(calls) == 1:
+            return {symbol: pd.Series(dtype=float) for symbol in symbols}
+        return {symbol: pd.Series(0.01, index=months) for symbol in symbols}
+
+    monkeypatch.setattr(performance, "ensure_benchmark_cache", lambda *args, **kwargs: {})
+    monkeypatch.setattr(performance, "get_benchmark_series_many", flaky_benchmarks)
+    monkeypatch.setattr(performance, "configured_benchmarks", lambda: ("SPY",))
+    performance._collect_cached.cache_clear()
+
+    def collect():
+        return performance.collect_performance_data(
+            sources=[performance.SourceKind.SAVVYTRADER],
+            savvy_json=data_path,
+            include_metrics=False,
+        )
+
+    first = collect()
+    assert first.missing == ["benchmark SPY (no data)"]
+    second = collect()
+    assert second.missing == []
+    assert "SPY" in second.combined.columns
+    collect()
+    assert len(calls) == 2
+
+
+def test_build_metric_matrix_aligns_columns_and_marks_gaps():
+    import numpy as np
+    import pandas as pd
+
+    from portfolio_cli.analysis import PerformanceMetrics, PortfolioAnalysis
+    from portfolio_cli.performance import build_metric_matrix
+
+    perf = PerformanceMetrics(cagr=0.1, max_dd_monthly=-0.05, ytd=None, sharpe=1.2, sortino=1.5)
+    metrics = {"A": PortfolioAnalysis(monthly_returns=pd.Series(dtype=float), metrics=perf)}
+
+    matrix = build_metric_matrix(metrics, ["B", "A"])
+
+    np.testing.assert_array_equal(matrix["cagr"], [np.nan, 0.1])
+    np.testing.assert_array_equal(matrix["ytd"], [np.nan, np.nan])
+    np.testing.assert_array_equal(matrix["sortino"], [np.nan, 1.5])
+
+
 def test_shell_sources_command(capsys):
     start_shell(
         app,
@@ -167,6 +307,21 @@ def test_shell_reload_executes(monkeypatch):
     assert called["args"] == [sys.executable, "-m", "portfolio_cli", "interactive"]
 
 
+def test_shell_reload_fast_reimports_in_place(monkeypatch):
+    shell = PortfolioShell(app)
+    shell._command_cache["report"] = None
+    reloaded = []
+
+    monkeypatch.setattr("portfolio_cli.shell.importlib.reload", reloaded.append)
+    monkeypatch.setattr("portfolio_cli.shell.os.execv", lambda *a: pytest.fail("restarted"))
+
+    shell.do_reload("fast")
+
+    assert reloaded[0].__name__ == "portfolio_cli.defaults"
+    assert reloaded[-1].__name__ == "portfolio_cli"
+    assert shell._command_cache == {}
+
+
 def test_shell_ls_alias(capsys):
     shell = PortfolioShell(app)
     shell.do_ls("")
@@ -0,0 +1,101 @@
+import sqlite3
+import zlib
+
+import pytest
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from scripts import crypto_db
+
+PASSPHRASE = "correct horse battery staple"
+
+
+@pytest.fixture
+def handle(tmp_path):
+    db = crypto_db.open_encrypted_db(str(tmp_path / "vault.db"), PASSPHRASE)
+    yield db
+    db.conn.close()
+
+
+def _meta(conn, key):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+@pytest.mark.parametrize(
+    "data, compress, flag",
+    [
+        (b'{"summaryDate": "2024-01-02"}' * 40, True, crypto_db._ZLIB_FLAG),
+        (b"short,csv\n", True, crypto_db._RAW_FLAG),
+        (b'{"summaryDate": "2024-01-02"}' * 40, False, crypto_db._RAW_FLAG),
+    ],
+)
+def test_encrypt_round_trips_with_expected_flag(handle, data, compress, flag):
+    cipher, nonce = crypto_db.encrypt_bytes(handle, data, compress=compress)
+
+    assert crypto_db.decrypt_bytes(handle, cipher, nonce) == data
+    plain = handle.aesgcm.decrypt(nonce, cipher, associated_data=None)
+    assert plain[:1] == flag
+    if flag == crypto_db._ZLIB_FLAG:
+        assert zlib.decompress(plain[1:]) == data
+
+
+def test_unflagged_legacy_blob_still_decrypts(handle):
+    nonce = handle.next_nonce()
+    cipher = handle.aesgcm.encrypt(nonce, b'[{"legacy": true}]', associated_data=None)
+
+    assert crypto_db.decrypt_bytes(handle, cipher, nonce) == b'[{"legacy": true}]'
+
+
+def test_new_database_records_scrypt_and_reopens(tmp_path):
+    path = str(tmp_path / "vault.db")
+    first = crypto_db.open_encrypted_db(path, PASSPHRASE)
+    cipher, nonce = crypto_db.encrypt_bytes(first, b"payload")
+    assert _meta(first.conn, crypto_db.KDF_META_KEY) == "scrypt"
+    first.conn.close()
+
+    second = crypto_db.open_encrypted_db(path, PASSPHRASE)
+    assert second.salt == first.salt
+    assert crypto_db.decrypt_bytes(second, cipher, nonce) == b"payload"
+    second.conn.close()
+
+
+def test_database_without_kdf_row_keeps_pbkdf2(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    salt = bytes(range(16))
+    conn = sqlite3.connect(path, isolation_level=None)
+    crypto_db._ensure_schema(conn)
+    conn.execute("INSERT INTO meta(key, value) VALUES(?, ?)", (crypto_db.SALT_META_KEY, salt.hex()))
+    conn.close()
+    legacy = AESGCM(crypto_db._derive_key(PASSPHRASE, salt, "pbkdf2"))
+    nonce = b"\x00" * 12
+    cipher = legacy.encrypt(nonce, crypto_db._RAW_FLAG + b"old blob", associated_data=None)
+
+    handle = crypto_db.open_encrypted_db(path, PASSPHRASE)
+
+    assert crypto_db.decrypt_bytes(handle, cipher, nonce) == b"old blob"
+    assert _meta(handle.conn, crypto_db.KDF_META_KEY) is None
+    handle.conn.close()
+
+
+def test_next_nonce_is_unique_and_wraps(handle):
+    handle.nonce_counter = 2**64 - 2
+    nonces = [handle.next_nonce() for _ in range(4)]
+
+    assert len(set(nonces)) == 4
+    assert all(len(n) == 12 and n[:4] == handle.nonce_prefix for n in nonces)
+    assert [int.from_bytes(n[4:], "big") for n in nonces] == [2**64 - 1, 0, 1, 2]
+
+
+def test_decrypt_sql_function(handle):
+    cipher, nonce = crypto_db.encrypt_bytes(handle, b"x" * 1000)
+    handle.conn.execute(
+        "INSERT INTO valuations(as_of_date, payload_cipher, payload_nonce) VALUES (?, ?, ?)",
+        ("2024-01-31", cipher, nonce),
+    )
+    handle.conn.execute("INSERT INTO valuations(as_of_date) VALUES ('2024-02-29')")
+
+    rows = handle.conn.execute(
+        "SELECT decrypt(payload_cipher, payload_nonce) FROM valuations ORDER BY as_of_date"
+    ).fetchall()
+
+    assert rows == [(b"x" * 1000,), (None,)]
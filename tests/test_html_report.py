@@ -40,3 +40,30 @@ def test_render_html_contains_tables_and_metrics():
     assert "SPY" in html
     assert "CAGR" in html
     assert "2024-01" in html
+
+
+def test_percent_cells_formats_returns_and_gaps():
+    from portfolio_cli.report import percent_cells
+
+    df = pd.DataFrame({"A": [0.0123, None], "B": [-0.5, 0.0]})
+
+    assert percent_cells(df) == [["1.2%", "-50.0%"], ["—", "0.0%"]]
+
+
+def test_tables_without_columns_have_no_empty_cells():
+    from portfolio_cli.performance import build_metric_matrix
+    from portfolio_cli.report import _build_monthly_table, _build_summary_table
+
+    monthly = _build_monthly_table(
+        pd.DataFrame(index=pd.period_range("2024-01", periods=2, freq="M"))
+    )
+    summary = _build_summary_table([], build_metric_matrix({}, []))
+
+    assert "<td></td>" not in monthly + summary
+    assert "<tr><td>2024-01</td></tr>" in monthly
+    assert "<tr><td>CAGR</td></tr>" in summary
+
+    one = _build_monthly_table(
+        pd.DataFrame({"SPY": [0.01]}, index=pd.period_range("2024-01", periods=1, freq="M"))
+    )
+    assert "<tr><td>2024-01</td><td>1.0%</td></tr>" in one
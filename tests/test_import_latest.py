@@ -0,0 +1,169 @@
+import argparse
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+from scripts import crypto_db, import_latest
+from scripts.import_latest import Candidate, pick_latest_json
+
+DAY = 24 * 60 * 60
+NOW = 1_720_000_000  # 2024-07-03
+
+
+def _dump(path: Path, dates, mtime: float) -> Candidate:
+    path.write_text(json.dumps([{"summaryDate": d, "dailyTotalValueChange": 0.0} for d in dates]))
+    os.utime(path, (mtime, mtime))
+    return Candidate(path=path, mtime=mtime, size=path.stat().st_size)
+
+
+@pytest.fixture
+def parsed(monkeypatch):
+    """Record which files pick_latest_json actually opens."""
+    names = []
+    real = import_latest._max_summary_date
+
+    def tracking(path):
+        names.append(path.name)
+        return real(path)
+
+    monkeypatch.setattr(import_latest, "_max_summary_date", tracking)
+    return names
+
+
+def test_pick_latest_json_stops_once_older_files_cannot_win(tmp_path, parsed):
+    newest = _dump(tmp_path / "new.json", ["2024-07-01", "2024-07-02"], NOW)
+    middle = _dump(tmp_path / "mid.json", ["2024-07-01"], NOW - DAY // 2)
+    oldest = _dump(tmp_path / "old.json", ["2024-06-01"], NOW - 10 * DAY)
+
+    best = pick_latest_json([oldest, middle, newest])
+
+    assert best is newest
+    assert best.as_of.date().isoformat() == "2024-07-02"
+    assert parsed == ["new.json", "mid.json"]
+
+
+def test_pick_latest_json_prefers_later_summary_date_over_mtime(tmp_path, parsed):
+    # A re-saved old dump is newer on disk but holds older valuations.
+    resaved = _dump(tmp_path / "resaved.json", ["2024-05-31"], NOW)
+    latest = _dump(tmp_path / "latest.json", ["2024-07-02"], NOW - DAY // 2)
+
+    assert pick_latest_json([resaved, latest]) is latest
+
+
+def test_pick_latest_json_keeps_scanning_when_newest_has_no_summary_date(tmp_path, parsed):
+    undated = tmp_path / "undated.json"
+    undated.write_text("{}")
+    os.utime(undated, (NOW, NOW))
+    undated_cand = Candidate(path=undated, mtime=NOW, size=2)
+    dated = _dump(tmp_path / "dated.json", ["2024-07-10"], NOW - 10 * DAY)
+    stale = _dump(tmp_path / "stale.json", ["2024-06-01"], NOW - 40 * DAY)
+
+    assert pick_latest_json([stale, undated_cand, dated]) is dated
+    assert parsed == ["undated.json", "dated.json"]
+
+
+def test_pick_latest_json_breaks_ties_by_name(tmp_path, parsed):
+    first = _dump(tmp_path / "a.json", ["2024-07-02"], NOW)
+    second = _dump(tmp_path / "b.json", ["2024-07-02"], NOW)
+
+    assert pick_latest_json([second, first]) is second
+    assert pick_latest_json([first, second]) is second
+    assert pick_latest_json([]) is None
+
+
+@pytest.fixture
+def db(tmp_path):
+    handle = crypto_db.open_encrypted_db(str(tmp_path / "local.db"), "passphrase")
+    yield handle
+    handle.conn.close()
+
+
+@pytest.mark.parametrize("has_returning", [True, False])
+def test_insert_file_row_returns_existing_id_for_duplicate_content(
+    tmp_path, db, monkeypatch, has_returning
+):
+    monkeypatch.setattr(import_latest, "_SQLITE_HAS_RETURNING", has_returning)
+    first_path = tmp_path / "first.json"
+    second_path = tmp_path / "second.json"
+    first_path.write_bytes(b"[]")
+    second_path.write_bytes(b"[]")
+
+    ids = [
+        import_latest.insert_file_row(
+            db, source="savvytrader", original=path, archive_path=None, content_bytes=b"[]"
+        )
+        for path in (first_path, second_path)
+    ]
+
+    assert ids[0] == ids[1]
+    assert db.conn.execute("SELECT COUNT(*) FROM files").fetchone() == (1,)
+
+
+def test_stage_file_copies_archives_and_reads_content(tmp_path, monkeypatch):
+    monkeypatch.setattr(import_latest, "ARCHIVE_DIR", tmp_path / "archive")
+    src = tmp_path / "export.csv"
+    src.write_bytes(b"Monthly,Ending\n")
+    cand = Candidate(path=src, mtime=src.stat().st_mtime, size=15)
+
+    archive, content = import_latest._stage_file(
+        cand, tmp_path / "canonical.csv", dry_run=True, read=True
+    )
+    assert content == b"Monthly,Ending\n"
+    assert src.exists() and not archive.exists()
+    assert not (tmp_path / "canonical.csv").exists()
+
+    archive, content = import_latest._stage_file(
+        cand, tmp_path / "canonical.csv", dry_run=False, read=False
+    )
+    assert content is None
+    assert not src.exists()
+    assert archive.read_bytes() == (tmp_path / "canonical.csv").read_bytes() == b"Monthly,Ending\n"
+
+
+def test_run_stages_both_exports_and_writes_rows_in_one_transaction(tmp_path, monkeypatch):
+    import_dir = tmp_path / "import"
+    import_dir.mkdir()
+    monkeypatch.setattr(import_latest, "IMPORT_DIR", import_dir)
+    monkeypatch.setattr(import_latest, "ARCHIVE_DIR", import_dir / "archive")
+    monkeypatch.setattr(import_latest, "LOCAL_DB_PATH", tmp_path / "local.db")
+    monkeypatch.setattr(import_latest, "CANONICAL_JSON", tmp_path / "valuations.json")
+    monkeypatch.setattr(import_latest, "CANONICAL_FIDELITY", tmp_path / "fidelity.csv")
+    monkeypatch.setenv("MINGDOM_DB_PASSPHRASE", "passphrase")
+    # Create the DB (and its salt) up front so only run()'s own writes are counted below.
+    crypto_db.open_encrypted_db(str(tmp_path / "local.db"), "passphrase").conn.close()
+
+    _dump(import_dir / "valuations-20240702.json", ["2024-07-02"], NOW)
+    (import_dir / "fidelity.csv").write_bytes(b"Monthly,Ending\n")
+    payload = (import_dir / "valuations-20240702.json").read_bytes()
+
+    transactions = []
+    real_bulk_write = crypto_db.bulk_write
+
+    @contextmanager
+    def counting_bulk_write(conn):
+        transactions.append(conn)
+        with real_bulk_write(conn):
+            yield
+
+    monkeypatch.setattr(crypto_db, "bulk_write", counting_bulk_write)
+
+    assert import_latest.run(argparse.Namespace(dry_run=False, verbose=False)) == 0
+
+    assert len(transactions) == 1
+    assert (tmp_path / "valuations.json").read_bytes() == payload
+    assert (tmp_path / "fidelity.csv").read_bytes() == b"Monthly,Ending\n"
+    assert not list(import_dir.glob("*.json")) and not list(import_dir.glob("*.csv"))
+
+    handle = crypto_db.open_encrypted_db(str(tmp_path / "local.db"), "passphrase")
+    try:
+        sources = handle.conn.execute("SELECT source FROM files ORDER BY id").fetchall()
+        valuations = handle.conn.execute(
+            "SELECT as_of_date, source, decrypt(payload_cipher, payload_nonce) FROM valuations"
+        ).fetchall()
+    finally:
+        handle.conn.close()
+    assert sources == [("savvytrader",), ("fidelity",)]
+    assert valuations == [("2024-07-02", "savvytrader", payload)]
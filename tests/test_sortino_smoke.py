@@ -1,6 +1,5 @@
 import json
 from datetime import datetime, timedelta
-from tempfile import NamedTemporaryFile
 
 from sortino import convert_to_monthly_and_calculate_ratios
 
@@ -23,12 +22,13 @@ def _sample_data():
     return rows
 
 
-def test_smoke_runs_and_prints(capsys):
-    data = _sample_data()
-    with NamedTemporaryFile("w+", suffix=".json") as tmp:
-        json.dump(data, tmp)
-        tmp.flush()
-        convert_to_monthly_and_calculate_ratios(json_file=tmp.name, annual_rf=0.04, current_year=2024)
+def test_smoke_runs_and_prints(tmp_path, capsys):
+    # Keep the input (and the parse cache written next to it) inside pytest's temp dir.
+    json_file = tmp_path / "valuations.json"
+    json_file.write_text(json.dumps(_sample_data()))
+    convert_to_monthly_and_calculate_ratios(
+        json_file=str(json_file), annual_rf=0.04, current_year=2024
+    )
 
     out = capsys.readouterr().out
     # Basic smoke checks